@@ -0,0 +1,148 @@
+import asyncio
+import hashlib
+import time
+from langchain_core.messages import AIMessage, AIMessageChunk
+
+# Deterministic offline stand-ins for ChatGroq and the search tools. Same inputs -> same outputs,
+# with a fixed latency per call and configurable payload sizes, so benchmark runs are comparable
+# across commits and need no API keys or network.
+
+_WORDS = (
+    "model protein structure training dataset benchmark accuracy latency research method result "
+    "analysis system approach evaluation performance network inference data paper study"
+).split()
+
+
+def _num(seed: str) -> int:
+    # stable across processes, unlike hash()
+    return int.from_bytes(hashlib.sha256(seed.encode()).digest()[:4], "big") % 10_000
+
+
+def _text(seed: str, chars: int) -> str:
+    """`chars` characters of filler that differs per seed (so dedup doesn't collapse everything)."""
+    digest = hashlib.sha256(seed.encode()).digest()
+    words, i = [], 0
+    while sum(len(w) + 1 for w in words) < chars:
+        words.append(_WORDS[digest[i % len(digest)] % len(_WORDS)] + str(digest[(i * 7) % len(digest)] % 10))
+        i += 1
+    return " ".join(words)[:chars]
+
+
+class FakeChatGroq:
+    """Answers each agent's prompt with something its parser accepts, after `latency` seconds.
+    Reports usage_metadata like ChatGroq so token metrics are populated."""
+
+    latency = 0.2
+    report_chars = 4000
+
+    def __init__(self, model: str = "fake", temperature: float = 0, **kwargs):
+        self.model_name = model
+        self.temperature = temperature
+
+    def _answer(self, messages) -> str:
+        system, human = messages[0].content, messages[-1].content
+        if "planning expert" in system:
+            n = int(human.rsplit("Generate ", 1)[1].split()[0])
+            return "\n".join(f"{i + 1}. Sub-question {i + 1} about {human[15:60]}?" for i in range(n))
+        if "critical research reviewer" in system:
+            # one round of gaps, then satisfied — the gap search's findings carry the marker back
+            return "NO_GAPS" if "follow-up coverage" in human else "• Missing follow-up coverage of recent work"
+        if "supervisor" in system:
+            return "writer"
+        return "## Report\n\n" + _text(human[:200], self.report_chars) + "\n\n### Sources\n[1]"
+
+    def _message(self, messages) -> AIMessage:
+        content = self._answer(messages)
+        prompt_chars = sum(len(m.content) for m in messages)
+        return AIMessage(
+            content=content,
+            usage_metadata={"input_tokens": prompt_chars // 4, "output_tokens": len(content) // 4,
+                            "total_tokens": (prompt_chars + len(content)) // 4},
+        )
+
+    def invoke(self, messages, *args, **kwargs) -> AIMessage:
+        time.sleep(self.latency)
+        return self._message(messages)
+
+    async def ainvoke(self, messages, *args, **kwargs) -> AIMessage:
+        await asyncio.sleep(self.latency)
+        return self._message(messages)
+
+    def stream(self, messages, *args, **kwargs):
+        time.sleep(self.latency)
+        for word in self._message(messages).content.split(" "):
+            yield AIMessageChunk(content=word + " ")
+
+    async def astream(self, messages, *args, **kwargs):
+        await asyncio.sleep(self.latency)
+        for word in self._message(messages).content.split(" "):
+            yield AIMessageChunk(content=word + " ")
+
+
+class FakeTools:
+    """Tool functions with the real tools' signatures and result shapes."""
+
+    def __init__(self, latency: float = 0.3, payload_chars: int = 600):
+        self.latency = latency
+        self.payload_chars = payload_chars
+
+    def _tavily(self, query: str, max_results: int) -> list[dict]:
+        return [
+            {"title": f"{query[:40]} ({i})", "url": f"https://example.com/{_num(query)}/{i}",
+             "content": _text(f"tavily{query}{i}", self.payload_chars), "score": 1.0 - i / 10}
+            for i in range(max_results)
+        ]
+
+    def _arxiv(self, query: str, max_results: int) -> list[dict]:
+        return [
+            {"title": f"On {query[:40]} ({i})", "authors": ["A. Author"], "summary": _text(f"arxiv{query}{i}", self.payload_chars),
+             "pdf_url": f"https://arxiv.org/pdf/2401.{_num(query):05d}v{i}", "published": "2024-01-01"}
+            for i in range(max_results)
+        ]
+
+    def _wikipedia(self, query: str) -> dict:
+        return {"title": query[:40], "summary": _text(f"wiki{query}", self.payload_chars),
+                "url": f"https://en.wikipedia.org/wiki/{_num(query)}"}
+
+    def tavily_search(self, query: str, max_results: int = 5) -> list[dict]:
+        time.sleep(self.latency)
+        return self._tavily(query, max_results)
+
+    async def atavily_search(self, query: str, max_results: int = 5) -> list[dict]:
+        await asyncio.sleep(self.latency)
+        return self._tavily(query, max_results)
+
+    def arxiv_search(self, query: str, max_results: int = 3) -> list[dict]:
+        time.sleep(self.latency)
+        return self._arxiv(query, max_results)
+
+    def wikipedia_search(self, query: str) -> dict:
+        time.sleep(self.latency)
+        return self._wikipedia(query)
+
+    async def awikipedia_search(self, query: str) -> dict:
+        await asyncio.sleep(self.latency)
+        return self._wikipedia(query)
+
+
+def install(llm_latency: float, tool_latency: float, payload_chars: int, report_chars: int) -> None:
+    """Swaps the fakes in. Import-order sensitive: call before the first get_llm()/graph build."""
+    import src.clients as clients
+    import src.agents.researcher as researcher
+    from src.metrics import instrument_tool
+
+    FakeChatGroq.latency = llm_latency
+    FakeChatGroq.report_chars = report_chars
+    clients.ChatGroq = FakeChatGroq
+    tools = FakeTools(tool_latency, payload_chars)
+    # keep the metrics wrappers so /metrics tool histograms look like production
+    researcher._SYNC_TOOLS.update(
+        tavily=instrument_tool("tavily")(tools.tavily_search),
+        arxiv=instrument_tool("arxiv")(tools.arxiv_search),
+        wikipedia=instrument_tool("wikipedia")(tools.wikipedia_search),
+    )
+    researcher._ASYNC_TOOLS.update(
+        tavily=instrument_tool("tavily")(tools.atavily_search),
+        arxiv=instrument_tool("arxiv")(tools.arxiv_search),  # arxiv has no async variant in the app either
+        wikipedia=instrument_tool("wikipedia")(tools.awikipedia_search),
+    )
@@ -0,0 +1,224 @@
+"""Offline throughput benchmark for the research pipeline.
+
+Runs N concurrent jobs per depth against fake LLM/tool stand-ins (bench/fakes.py) with fixed
+latencies, either straight through build_graph() or through the FastAPI app (scheduler, job
+table, SSE bus included), and reports p50/p95/p99 job latency, jobs/s, checkpoint DB growth and
+peak memory. Needs no network and no API keys.
+
+    python -m bench.run --jobs 8 --depths quick,standard,deep
+    python -m bench.run --mode api --async-graph --jobs 20 --json bench.json
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import math
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+try:
+    import resource  # POSIX only — peak RSS is reported as None elsewhere
+except ImportError:
+    resource = None
+
+
+def _args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    p.add_argument("--mode", choices=("graph", "api"), default="graph", help="drive build_graph() directly or the FastAPI app")
+    p.add_argument("--jobs", type=int, default=8, help="concurrent jobs per depth")
+    p.add_argument("--depths", default="quick,standard,deep")
+    p.add_argument("--async-graph", action="store_true", help="async nodes + AsyncSqliteSaver (ARGUS_ASYNC_GRAPH)")
+    p.add_argument("--fan-out", action="store_true", help="parallel research branches (ARGUS_FAN_OUT)")
+    p.add_argument("--speculative", action="store_true", help="raw-query search during planning (ARGUS_SPECULATIVE_SEARCH)")
+    p.add_argument("--llm-latency", type=float, default=0.2, help="seconds per fake completion")
+    p.add_argument("--tool-latency", type=float, default=0.3, help="seconds per fake search call")
+    p.add_argument("--payload-chars", type=int, default=600, help="characters per fake search result")
+    p.add_argument("--report-chars", type=int, default=4000, help="characters per fake report")
+    p.add_argument("--caches", action="store_true", help="keep the tool/LLM caches on (off by default so every job does the work)")
+    p.add_argument("--json", help="also write the results to this file")
+    return p.parse_args()
+
+
+def _configure(args: argparse.Namespace, data_dir: str) -> None:
+    # everything below is read at import time, so it has to be set before src is imported
+    os.environ.update({
+        "ARGUS_DATA_DIR": data_dir,
+        "ARGUS_ASYNC_GRAPH": str(args.async_graph).lower(),
+        "ARGUS_FAN_OUT": str(args.fan_out).lower(),
+        "ARGUS_SPECULATIVE_SEARCH": str(args.speculative).lower(),
+        "ARGUS_TOOL_CACHE": str(args.caches).lower(),
+        "ARGUS_LLM_CACHE": str(args.caches).lower(),
+        "ARGUS_RESULT_REUSE_SECONDS": "0",
+        "ARGUS_JOB_QUEUE_SIZE": str(max(20, args.jobs)),
+        "ARGUS_CHECKPOINT_COMPACTION_INTERVAL": "86400",
+        "GROQ_API_KEY": "offline",
+        "TAVILY_API_KEY": "offline",
+        "LANGSMITH_TRACING_V2": "false",
+    })
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def _percentile(values: list[float], pct: float) -> float | None:
+    if not values:
+        return None  # every job failed
+    ordered = sorted(values)
+    return round(ordered[max(0, math.ceil(len(ordered) * pct / 100) - 1)], 3)
+
+
+def _db_bytes(db_path: Path) -> int:
+    # file sizes lie while pages sit in a -wal that sqlite reuses — fold it back in and count pages
+    conn = sqlite3.connect(str(db_path), timeout=30)
+    try:
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return conn.execute("PRAGMA page_count").fetchone()[0] * conn.execute("PRAGMA page_size").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def _checkpoint_rows(db_path: Path) -> int:
+    conn = sqlite3.connect(str(db_path))
+    try:
+        return conn.execute("SELECT COUNT(*) FROM checkpoints").fetchone()[0]
+    except sqlite3.OperationalError:
+        return 0
+    finally:
+        conn.close()
+
+
+def _peak_rss_mb() -> float | None:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)  # bytes on macOS, KiB on Linux
+
+
+def _queries(depth: str, n: int) -> list[str]:
+    run = uuid.uuid4().hex[:6]  # distinct per run so nothing is reused across rounds
+    return [f"Benchmark topic {run}-{depth}-{i}: recent progress in area {i}" for i in range(n)]
+
+
+def _run_graph(args, depth: str) -> tuple[list[float], int]:
+    from src.graph.pipeline import build_graph
+    from src.api.routes.research import _initial_state
+
+    # a job that raises counts as failed (None) and stays out of the latencies, as in api mode
+    def _one(graph, query: str) -> float | None:
+        start = time.perf_counter()
+        try:
+            graph.invoke(_initial_state(query, depth, False), config={"configurable": {"thread_id": str(uuid.uuid4())}})
+        except Exception as e:
+            print(f"[BENCH] {depth} job failed: {e!r}", file=sys.stderr)
+            return None
+        return time.perf_counter() - start
+
+    async def _aone(graph, query: str) -> float | None:
+        start = time.perf_counter()
+        try:
+            await graph.ainvoke(_initial_state(query, depth, False), config={"configurable": {"thread_id": str(uuid.uuid4())}})
+        except Exception as e:
+            print(f"[BENCH] {depth} job failed: {e!r}", file=sys.stderr)
+            return None
+        return time.perf_counter() - start
+
+    async def _arun() -> list[float | None]:
+        from src.persistence.checkpointer import get_async_checkpointer
+        checkpointer = await get_async_checkpointer()
+        graph = build_graph(async_nodes=True, checkpointer=checkpointer)
+        try:
+            return list(await asyncio.gather(*(_aone(graph, q) for q in _queries(depth, args.jobs))))
+        finally:
+            # aiosqlite's worker thread isn't a daemon — a failed job's traceback can keep the
+            # connection alive past asyncio.run and hang interpreter exit
+            await checkpointer.conn.close()
+
+    if args.async_graph:
+        outcomes = asyncio.run(_arun())
+    else:
+        graph = build_graph()
+        with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+            outcomes = list(pool.map(lambda q: _one(graph, q), _queries(depth, args.jobs)))
+    return [o for o in outcomes if o is not None], outcomes.count(None)
+
+
+def _run_api(client, depth: str, jobs: int) -> tuple[list[float], int]:
+    from datetime import datetime
+    from src.persistence.db import get_job
+
+    ids = []
+    for query in _queries(depth, jobs):
+        response = client.post("/research", json={"query": query, "depth": depth, "force_refresh": True})
+        response.raise_for_status()
+        ids.append(response.json()["job_id"])
+    pending = set(ids)
+    while pending:
+        time.sleep(0.02)
+        pending = {i for i in pending if client.get(f"/jobs/{i}/status").json()["status"] not in ("complete", "failed")}
+    latencies, failed = [], 0
+    for job_id in ids:
+        job = get_job(job_id)
+        if job["status"] == "failed":
+            failed += 1
+            continue  # percentiles are over completed jobs only, same as graph mode
+        # created_at -> terminal write: queue wait + run, as the user experiences it
+        latencies.append((datetime.fromisoformat(job["updated_at"]) - datetime.fromisoformat(job["created_at"])).total_seconds())
+    return latencies, failed
+
+
+def main() -> None:
+    args = _args()
+    data_dir = tempfile.mkdtemp(prefix="argus-bench-")
+    _configure(args, data_dir)
+
+    from bench.fakes import install
+    install(args.llm_latency, args.tool_latency, args.payload_chars, args.report_chars)
+    from src.persistence.db import DB_PATH, init_db
+    init_db()
+
+    client = None
+    with contextlib.ExitStack() as stack:
+        if args.mode == "api":
+            from fastapi.testclient import TestClient
+            from src.api.limiter import limiter
+            from src.api.main import app
+            limiter.enabled = False  # 5/hour per IP would stop the benchmark at the sixth job
+            client = stack.enter_context(TestClient(app))
+
+        rows = []
+        for depth in args.depths.split(","):
+            bytes_before, checkpoints_before = _db_bytes(DB_PATH), _checkpoint_rows(DB_PATH)
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):  # agents print progress lines
+                latencies, failed = _run_api(client, depth, args.jobs) if client else _run_graph(args, depth)
+            wall = time.perf_counter() - start
+            rows.append({
+                "depth": depth,
+                "jobs": len(latencies) + failed,
+                "failed": failed,
+                "p50_s": _percentile(latencies, 50),
+                "p95_s": _percentile(latencies, 95),
+                "p99_s": _percentile(latencies, 99),
+                "jobs_per_s": round(len(latencies) / wall, 2),
+                "db_growth_kb": round((_db_bytes(DB_PATH) - bytes_before) / 1024, 1),
+                "checkpoints_added": _checkpoint_rows(DB_PATH) - checkpoints_before,
+                "peak_rss_mb": _peak_rss_mb(),
+            })
+
+    config = {k: v for k, v in vars(args).items() if k != "json"}
+    print(f"argus bench — {json.dumps(config)}")
+    columns = list(rows[0])
+    print("  ".join(f"{c:>17}" for c in columns))
+    for row in rows:
+        print("  ".join(f"{str(row[c]):>17}" for c in columns))
+    if args.json:
+        Path(args.json).write_text(json.dumps({"config": config, "results": rows}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
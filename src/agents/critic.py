@@ -1,6 +1,11 @@
+import asyncio
 import os
-from langchain_groq import ChatGroq
 from src.graph.state import ReasearchState
+from src.persistence.db import load_findings
+from src.agents.findings import prepare_findings, coverage_scores
+from src.metrics import CRITIC_DECISIONS
+from src.agents.llm_cache import invoke_cached, ainvoke_cached
+from src.clients import get_llm
 from langchain_core.messages import AIMessage,SystemMessage,HumanMessage
 
 _SYSTEM_PROMPT = """You are a critical research reviewer. Your job is to identify GAPS in research provided.
@@ -20,13 +25,25 @@ Example output without gaps:
 NO_GAPS
 """
 
-def critic_node(state:ReasearchState)->dict:
-    llm = ChatGroq(
-        model="llama-3.3-70b-versatile",
-        api_key=os.getenv("GROQ_API_KEY"),
-        temperature=0,
-    )
-    findings_summary = "\n".join(state.get("research_findings",[])[:20]) #cap at 20 to stay in context 
+# Local coverage check before the LLM review, scored on each sub-question's own aspect terms
+# (not the topic they all share): when every sub-question is clearly covered (score >=
+# _COVERAGE_HIGH) or clearly missing (< _COVERAGE_LOW) the critic decides on its own and the
+# missing sub-questions become the gaps; anything in between goes to the LLM.
+_LOCAL_REVIEW = os.getenv("ARGUS_CRITIC_LOCAL_REVIEW", "true").lower() in ("1", "true", "yes")
+_COVERAGE_HIGH = float(os.getenv("ARGUS_CRITIC_COVERAGE_HIGH", "0.7"))
+_COVERAGE_LOW = float(os.getenv("ARGUS_CRITIC_COVERAGE_LOW", "0.2"))
+_MAX_GAPS = 3  # same cap the LLM prompt sets
+
+def _coverage_review(state:ReasearchState,findings:list[str])->tuple[list[str] | None,list[float]]:
+    """(gaps, scores) — gaps is None when some sub-question is borderline and the LLM has to judge."""
+    questions = state.get("sub_questions") or [state["query"]]
+    scores = coverage_scores(findings, questions, state["query"])
+    if not _LOCAL_REVIEW or any(_COVERAGE_LOW <= score < _COVERAGE_HIGH for score in scores):
+        return None, scores
+    return [q for q, score in zip(questions, scores) if score < _COVERAGE_LOW][:_MAX_GAPS], scores
+
+def _messages(state:ReasearchState,findings:list[str])->list:
+    findings_summary = "\n".join(findings)
     sub_questions_text = "\n".join(state.get("sub_questions",[]))
     
     review_prompt = f"""Original query: {state['query']}
@@ -37,25 +54,54 @@ def critic_node(state:ReasearchState)->dict:
     
     identify any gaps in coverage.
     """ 
-    response = llm.invoke([
+    return [
         SystemMessage(content=_SYSTEM_PROMPT),
         HumanMessage(content=review_prompt)
-    ])
-    
-    content = response.content.strip()
+    ]
+
+def _parse_gaps(content:str)->list[str]:
+    content = content.strip()
     if "NO_GAPS" in content.upper():
-        gaps = []
+        return []
+    #parse bulleted list
+    return [
+        line.lstrip("•-* ").strip()
+        for line in content.split("\n")
+        if line.strip() and line.strip()[0] in ("•", "-", "*")
+    ]
+
+def _result(gaps:list[str],state:ReasearchState,dedup:dict)->dict:
+    CRITIC_DECISIONS.inc(by=dedup["decided_by"], outcome="gaps" if gaps else "no_gaps")
+    if not gaps:
         msg = "Critic : research is sufficient, no gaps identified."
     else:
-        #parse bulleted list
-        gaps = [
-            line.lstrip("•-* ").strip()
-            for line in content.split("\n")
-            if line.strip() and line.strip()[0] in ("•", "-", "*")
-        ]
         msg = f"Critic: identified {len(gaps)} gap(s) — routing back to researcher."
+    if dedup["decided_by"] == "coverage":
+        msg += " (coverage check, no LLM review)"
 
     return {
         "gaps_identified": gaps,
+        "reviewed_iterations": state.get("research_iterations",0),
+        "dedup_log": [dedup],
         "messages": [AIMessage(content=msg)],
-    }
\ No newline at end of file
+    }
+
+def critic_node(state:ReasearchState)->dict:
+    findings = load_findings(state.get("research_findings",[]))
+    gaps, scores = _coverage_review(state, findings)
+    if gaps is not None:
+        return _result(gaps, state, {"node": "critic", "decided_by": "coverage", "coverage": scores})
+    llm = get_llm(temperature=0)
+    findings, dedup = prepare_findings("critic", state, findings, llm.model_name)
+    response = invoke_cached(llm, _messages(state, findings), node="critic", bypass=state.get("bypass_llm_cache", False))
+    return _result(_parse_gaps(response.content), state, {**dedup, "decided_by": "llm", "coverage": scores})
+
+async def acritic_node(state:ReasearchState)->dict:
+    findings = await asyncio.to_thread(load_findings, state.get("research_findings",[]))
+    gaps, scores = _coverage_review(state, findings)
+    if gaps is not None:
+        return _result(gaps, state, {"node": "critic", "decided_by": "coverage", "coverage": scores})
+    llm = get_llm(temperature=0)
+    findings, dedup = prepare_findings("critic", state, findings, llm.model_name)
+    response = await ainvoke_cached(llm, _messages(state, findings), node="critic", bypass=state.get("bypass_llm_cache", False))
+    return _result(_parse_gaps(response.content), state, {**dedup, "decided_by": "llm", "coverage": scores})
@@ -0,0 +1,224 @@
+import math
+import os
+import re
+from collections import Counter
+from urllib.parse import urlparse
+
+# Local clean-up of research_findings before they are pasted into the critic/writer prompts.
+# The same article regularly comes back for several sub-questions and from both Tavily and
+# Wikipedia — near-duplicates are merged (word shingles, containment similarity) and the
+# survivors are ranked by BM25 against the query + sub-questions, most relevant first.
+# pack_findings then fits them into a per-node, per-depth token budget, and coverage_scores
+# lets the critic settle clear-cut reviews without an LLM call.
+# Pure python, no model calls; a few dozen findings take well under a millisecond.
+
+_SOURCES_MARKER = "\nSources: "
+_DUP_THRESHOLD = float(os.getenv("ARGUS_DEDUP_THRESHOLD", "0.7"))  # share of the smaller finding's shingles
+_SHINGLE_SIZE = 3
+_MIN_SHINGLES = 5  # below this a finding only matches an identical one
+_BM25_K1 = 1.5
+_BM25_B = 0.75
+
+# Findings tokens per prompt, by depth — fixes writer/critic prompt size (and so latency and
+# cost) per depth instead of letting it grow with however much research came back.
+_TOKEN_BUDGETS = {
+    "writer": {"quick": 2000, "standard": 4000, "deep": 7000},
+    "critic": {"quick": 1000, "standard": 1800, "deep": 2500},
+}
+# Per-model ceiling on findings tokens (context window minus system prompt, sources and answer,
+# and Groq's free-tier request size). ARGUS_MODEL_TOKEN_LIMIT overrides it for every model.
+_MODEL_TOKEN_LIMITS = {"llama-3.3-70b-versatile": 12000, "llama-3.1-8b-instant": 6000}
+_DEFAULT_MODEL_TOKEN_LIMIT = 4000
+_MODEL_TOKEN_LIMIT = os.getenv("ARGUS_MODEL_TOKEN_LIMIT")
+_BUDGET_SCALE = float(os.getenv("ARGUS_CONTEXT_BUDGET_SCALE", "1.0"))
+_OVERFLOW_SHARE = 0.15  # of the budget, reserved for one-line digests of findings that didn't fit
+
+_WORD = re.compile(r"[a-z0-9]+")
+_TOKEN = re.compile(r"\w+|[^\w\s]")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s")
+_TAG = re.compile(r"^\[[^\]]+\]\s*")  # "[Web] ", "[ArXiv] ", "[Wikipedia] "
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have how in is it its of on or that the this to was "
+    "were what when where which who why will with".split()
+)
+# planner boilerplate ("What are the main challenges of current X?") — says nothing about the topic
+_QUESTION_WORDS = frozenset(
+    "main key current recent latest new most major approaches state does do can there their".split()
+)
+
+def with_sources(text:str,urls:list[str])->str:
+    """Attaches the finding's URLs so they survive storage and dedup together with its text."""
+    return text + _SOURCES_MARKER + " ".join(urls) if urls else text
+
+def split_sources(finding:str)->tuple[str,list[str]]:
+    text, _, urls = finding.partition(_SOURCES_MARKER)
+    return text, urls.split()
+
+def _tokens(text:str)->list[str]:
+    return [w for w in _WORD.findall(text.lower()) if w not in _STOPWORDS]
+
+def _shingles(text:str)->set:
+    tokens = _tokens(_TAG.sub("", text))
+    if len(tokens) < _SHINGLE_SIZE:
+        return {tuple(tokens)}
+    return {tuple(tokens[i:i + _SHINGLE_SIZE]) for i in range(len(tokens) - _SHINGLE_SIZE + 1)}
+
+def _is_duplicate(a:set,b:set)->bool:
+    smaller = min(len(a), len(b))
+    if smaller < _MIN_SHINGLES:
+        return a == b
+    # containment rather than jaccard: a 400-char Tavily snippet of a Wikipedia summary is a duplicate
+    return len(a & b) / smaller >= _DUP_THRESHOLD
+
+def _bm25(docs:list[list[str]],query_terms:Counter)->list[float]:
+    n = len(docs)
+    avg_len = sum(len(d) for d in docs) / n or 1
+    df = Counter(t for d in docs for t in set(d))
+    scores = []
+    for doc in docs:
+        tf = Counter(doc)
+        norm = _BM25_K1 * (1 - _BM25_B + _BM25_B * len(doc) / avg_len)
+        score = 0.0
+        for term, weight in query_terms.items():
+            if tf[term]:
+                idf = math.log(1 + (n - df[term] + 0.5) / (df[term] + 0.5))
+                score += weight * idf * tf[term] * (_BM25_K1 + 1) / (tf[term] + norm)
+        scores.append(score)
+    return scores
+
+def dedupe_and_rank(findings:list[str],query:str,sub_questions:list[str])->tuple[list[str],dict]:
+    """Returns (findings, stats): near-duplicates merged into one entry carrying every source URL
+    (the longer text wins), ordered by relevance. stats records how much was removed."""
+    kept = []  # [text, urls, shingles]
+    for finding in findings:
+        text, urls = split_sources(finding)
+        shingles = _shingles(text)
+        for entry in kept:
+            if _is_duplicate(shingles, entry[2]):
+                if len(text) > len(entry[0]):
+                    entry[0], entry[2] = text, shingles
+                entry[1].extend(u for u in urls if u not in entry[1])
+                break
+        else:
+            kept.append([text, list(dict.fromkeys(urls)), shingles])
+
+    deduped = [with_sources(text, urls) for text, urls, _ in kept]
+    if deduped:
+        # the original query counts double — sub-questions are the planner's paraphrase of it
+        query_terms = Counter(_tokens(query)) + Counter(_tokens(query))
+        for q in sub_questions:
+            query_terms.update(_tokens(q))
+        scores = _bm25([_tokens(text) for text, _, _ in kept], query_terms)
+        order = sorted(range(len(deduped)), key=lambda i: -scores[i])  # stable: ties keep research order
+        deduped = [deduped[i] for i in order]
+
+    stats = {
+        "input": len(findings),
+        "kept": len(deduped),
+        "duplicates_removed": len(findings) - len(deduped),
+        "chars_removed": sum(map(len, findings)) - sum(map(len, deduped)),
+    }
+    return deduped, stats
+
+def count_tokens(text:str)->int:
+    """Local token estimate, no tokenizer download: Llama's BPE keeps common words whole and
+    splits long ones, so one token per word plus one per 6 characters beyond, plus punctuation.
+    Runs a little high on English prose, which is the safe side for a budget."""
+    return sum(1 + (len(t) - 1) // 6 for t in _TOKEN.findall(text))
+
+def token_budget(node:str,depth:str,model:str)->int:
+    limit = int(_MODEL_TOKEN_LIMIT) if _MODEL_TOKEN_LIMIT else _MODEL_TOKEN_LIMITS.get(model, _DEFAULT_MODEL_TOKEN_LIMIT)
+    return min(int(_TOKEN_BUDGETS[node].get(depth, _TOKEN_BUDGETS[node]["standard"]) * _BUDGET_SCALE), limit)
+
+def _diversity_key(finding:str)->str:
+    text, urls = split_sources(finding)
+    if urls:
+        return urlparse(urls[0]).netloc or urls[0]
+    tag = _TAG.match(text)
+    return tag.group(0) if tag else ""
+
+def _digest(finding:str)->str:
+    """One-line stand-in for a finding that didn't fit: tag + title + first sentence, URLs kept."""
+    text, urls = split_sources(finding)
+    head, sep, body = text.partition(": ")
+    first = _SENTENCE_END.split(body.strip(), maxsplit=1)[0] if sep else ""
+    line = f"- {head}: {first[:160]}" if first else f"- {head[:200]}"
+    return with_sources(line, urls).replace(_SOURCES_MARKER, " — ")
+
+def pack_findings(findings:list[str],budget:int)->tuple[list[str],dict]:
+    """Fills `budget` tokens from relevance-ordered findings. Sources are taken round-robin (each
+    domain's best finding before any domain's second) so one site can't fill the prompt. Findings
+    that don't fit are condensed into one-line digests in a reserved slice of the budget; only what
+    doesn't fit even as a digest is omitted."""
+    seen = Counter()
+    rounds = []
+    for rank, finding in enumerate(findings):
+        key = _diversity_key(finding)
+        rounds.append((seen[key], rank))
+        seen[key] += 1
+    order = [rank for _, rank in sorted(rounds)]
+
+    full_budget = budget if sum(count_tokens(f) for f in findings) <= budget else int(budget * (1 - _OVERFLOW_SHARE))
+    used = 0
+    packed, overflow = [], []
+    for rank in order:
+        cost = count_tokens(findings[rank])
+        if used + cost <= full_budget:
+            packed.append(rank)
+            used += cost
+        else:
+            overflow.append(rank)
+
+    digests = []
+    for rank in sorted(overflow):  # best-ranked overflow gets a digest first
+        line = _digest(findings[rank])
+        cost = count_tokens(line)
+        if used + cost > budget:
+            break
+        digests.append(line)
+        used += cost
+
+    out = [findings[rank] for rank in sorted(packed)]  # back to relevance order for the prompt
+    if digests:
+        out.append("Further findings (condensed):\n" + "\n".join(digests))
+    stats = {
+        "token_budget": budget,
+        "tokens_used": used,
+        "packed": len(packed),
+        "condensed": len(digests),
+        "omitted": len(overflow) - len(digests),
+    }
+    return out, stats
+
+def _stem(term:str)->str:
+    # plural "s" only — enough to match "breakthroughs" with "breakthrough" without a stemmer
+    return term[:-1] if len(term) > 3 and term.endswith("s") and not term.endswith("ss") else term
+
+def coverage_scores(findings:list[str],questions:list[str],query:str="")->list[float]:
+    """How well `findings` cover each question, 0..1: the share of the question's own terms,
+    IDF-weighted over the findings, that its best-matching finding contains. Terms a question
+    shares with `query` or with the other questions are the topic, not the aspect it asks about —
+    generic on-topic findings match those for every question — so they don't count (unless
+    nothing else is left). A term no finding mentions carries the most weight."""
+    docs = [{_stem(t) for t in _tokens(split_sources(f)[0])} for f in findings]
+    df = Counter(t for d in docs for t in d)
+    term_sets = [{_stem(t) for t in _tokens(q) if t not in _QUESTION_WORDS} for q in questions]
+    topic = {_stem(t) for t in _tokens(query)}
+    scores = []
+    for i, terms in enumerate(term_sets):
+        shared = topic.union(*(other for j, other in enumerate(term_sets) if j != i))
+        terms = (terms - shared) or terms
+        if not docs or not terms:
+            scores.append(0.0 if not docs else 1.0)
+            continue
+        idf = {t: math.log(1 + (len(docs) + 1) / (df[t] + 1)) for t in terms}
+        total = sum(idf.values())
+        scores.append(round(max(sum(w for t, w in idf.items() if t in d) for d in docs) / total, 3))
+    return scores
+
+def prepare_findings(node:str,state:dict,findings:list[str],model:str)->tuple[list[str],dict]:
+    """dedupe_and_rank + pack_findings for one prompt. Returns the findings to show and the
+    dedup_log entry describing what was merged, condensed or left out."""
+    findings, dedup = dedupe_and_rank(findings, state["query"], state.get("sub_questions",[]))
+    packed, packing = pack_findings(findings, token_budget(node, state.get("depth","standard"), model))
+    return packed, {"node": node, **dedup, **packing}
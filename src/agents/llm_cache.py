@@ -0,0 +1,101 @@
+import asyncio
+import hashlib
+import json
+import os
+from langchain_core.messages import AIMessage, BaseMessage
+from src.persistence.cache import SqliteCache
+from src.persistence.db import DB_PATH
+from src.metrics import record_llm_usage
+
+# Exact-match completion cache: same model + temperature + messages -> same stored answer.
+# Planner/critic/writer prompts are fully determined by state, so re-running a query or
+# retrying after a crash replays from here instead of spending tokens.
+LLM_CACHE_PATH = DB_PATH.parent / "llm_cache.db"
+
+_TTL = int(os.getenv("ARGUS_LLM_CACHE_TTL_SECONDS", str(7 * 86400)))
+_ENABLED = os.getenv("ARGUS_LLM_CACHE", "true").lower() in ("1", "true", "yes")
+_cache = SqliteCache(LLM_CACHE_PATH, max_entries=int(os.getenv("ARGUS_LLM_CACHE_MAX_ENTRIES", "2000")))
+
+
+def _key(llm, messages: list[BaseMessage]) -> str:
+    raw = json.dumps(
+        [llm.model_name, llm.temperature, [(m.type, m.content) for m in messages]],
+        sort_keys=True,
+    )
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+def invoke_cached(llm, messages: list[BaseMessage], node: str, bypass: bool = False) -> AIMessage:
+    """llm.invoke(messages) through the completion cache. `node` labels the hit/miss counters and token metrics.
+    bypass=True (per job, from ReasearchRequest.bypass_llm_cache) skips the lookup but still
+    stores the fresh answer so the next run can reuse it.
+    """
+    if not _ENABLED:
+        response = llm.invoke(messages)
+        record_llm_usage(node, response)
+        return response
+    key = _key(llm, messages)
+    if not bypass:
+        cached = _cache.get(node, key)
+        if cached is not None:
+            return AIMessage(content=cached["content"], response_metadata={"cache_hit": True})
+    response = llm.invoke(messages)
+    record_llm_usage(node, response)
+    _cache.set(node, key, {"content": response.content}, ttl=_TTL)
+    return response
+
+async def ainvoke_cached(llm, messages: list[BaseMessage], node: str, bypass: bool = False) -> AIMessage:
+    """Async counterpart of invoke_cached — the SQLite lookup and store run in a thread, never on the loop."""
+    if not _ENABLED:
+        response = await llm.ainvoke(messages)
+        record_llm_usage(node, response)
+        return response
+    key = _key(llm, messages)
+    if not bypass:
+        cached = await asyncio.to_thread(_cache.get, node, key)
+        if cached is not None:
+            return AIMessage(content=cached["content"], response_metadata={"cache_hit": True})
+    response = await llm.ainvoke(messages)
+    record_llm_usage(node, response)
+    await asyncio.to_thread(_cache.set, node, key, {"content": response.content}, ttl=_TTL)
+    return response
+
+def stream_cached(llm, messages: list[BaseMessage], node: str, bypass: bool = False):
+    """invoke_cached as a generator of text deltas, for callers that show output as it arrives.
+    A cache hit yields the stored answer in one piece; a fresh completion is cached only once the
+    stream has finished."""
+    key = _key(llm, messages) if _ENABLED else None
+    if key and not bypass:
+        cached = _cache.get(node, key)
+        if cached is not None:
+            yield cached["content"]
+            return
+    full = None
+    for chunk in llm.stream(messages):
+        full = chunk if full is None else full + chunk
+        if chunk.content:
+            yield chunk.content
+    if full is not None:
+        record_llm_usage(node, full)
+        if key:
+            _cache.set(node, key, {"content": full.content}, ttl=_TTL)
+
+async def astream_cached(llm, messages: list[BaseMessage], node: str, bypass: bool = False):
+    """Async counterpart of stream_cached."""
+    key = _key(llm, messages) if _ENABLED else None
+    if key and not bypass:
+        cached = await asyncio.to_thread(_cache.get, node, key)
+        if cached is not None:
+            yield cached["content"]
+            return
+    full = None
+    async for chunk in llm.astream(messages):
+        full = chunk if full is None else full + chunk
+        if chunk.content:
+            yield chunk.content
+    if full is not None:
+        record_llm_usage(node, full)
+        if key:
+            await asyncio.to_thread(_cache.set, node, key, {"content": full.content}, ttl=_TTL)
+
+def llm_cache_stats() -> dict:
+    return {"enabled": _ENABLED, **_cache.stats()}
@@ -1,6 +1,8 @@
-import os
-from langchain_groq import ChatGroq
 from src.graph.state import ReasearchState        
+from src.agents.llm_cache import invoke_cached, ainvoke_cached
+from src.clients import get_llm
+from src.agents.researcher import start_speculative_search, astart_speculative_search
+from langchain_core.runnables import RunnableConfig
 from langchain_core.messages import AIMessage,SystemMessage,HumanMessage
 
 
@@ -20,20 +22,17 @@ Rules:
 """
 
 
-def planner_node(state: ReasearchState) -> dict:
+def _messages(state: ReasearchState) -> list:
     n_questions = _DEPTH_QUESTION.get(state.get("depth", "standard"), 3)
     print(f"[PLANNER] Generating {n_questions} sub-questions for: {state['query'][:60]}")  # ← add this
-    llm = ChatGroq(
-        model="llama-3.3-70b-versatile",
-        api_key=os.getenv("GROQ_API_KEY"),
-        temperature=0.3,  
-    )
-    response = llm.invoke([
+    return [
         SystemMessage(content=_SYSTEM_PROMPT),
         HumanMessage(content=f"Research query:{state['query']}\nGenerate {n_questions} sub-questions.")
-    ])
+    ]
+
+def _result(content: str, state: ReasearchState) -> dict:
     #parse numbered list 
-    lines = response.content.strip().split("\n")
+    lines = content.strip().split("\n")
     sub_questions = []
     for line in lines:
         line = line.strip()
@@ -51,4 +50,25 @@ def planner_node(state: ReasearchState) -> dict:
     return {
         "sub_questions": sub_questions,
         "messages": [AIMessage(content=f"Planner: generated {len(sub_questions)} sub-questions.")],
-    }
\ No newline at end of file
+    }
+
+
+def planner_node(state: ReasearchState) -> dict:
+    llm = get_llm(temperature=0.3)
+    response = invoke_cached(llm, _messages(state), node="planner", bypass=state.get("bypass_llm_cache", False))
+    return _result(response.content, state)
+
+async def aplanner_node(state: ReasearchState) -> dict:
+    llm = get_llm(temperature=0.3)
+    response = await ainvoke_cached(llm, _messages(state), node="planner", bypass=state.get("bypass_llm_cache", False))
+    return _result(response.content, state)
+
+# build_graph(speculative=True) registers these instead: the raw-query searches start first and
+# run while the planner waits on its LLM call
+def speculative_planner_node(state: ReasearchState, config: RunnableConfig) -> dict:
+    start_speculative_search(config, state["query"], state.get("depth", "standard"))
+    return planner_node(state)
+
+async def aspeculative_planner_node(state: ReasearchState, config: RunnableConfig) -> dict:
+    astart_speculative_search(config, state["query"], state.get("depth", "standard"))
+    return await aplanner_node(state)
@@ -1,64 +1,279 @@
-import os
+import asyncio
+import threading
+import time
+from langchain_core.runnables import RunnableConfig
+from langgraph.types import Command, Send
 from src.tools.arxiv_tool import arxiv_search
-from src.tools.wikipedia_tool import wikipedia_search
-from src.tools.tavily_tool import tavily_search
+from src.tools.wikipedia_tool import wikipedia_search, awikipedia_search
+from src.tools.tavily_tool import tavily_search, atavily_search
+from src.tools.executor import run_tools, arun_tools, submit_tools, gather_tools
 from src.graph.state import ReasearchState
+from src.persistence.db import store_findings
+from src.agents.findings import with_sources, split_sources
+from src.metrics import SPECULATIVE_CALLS, SPECULATIVE_FINDINGS, SPECULATIVE_HEAD_START
 from langchain_core.messages import AIMessage
 
+#timeouts are per tool, in seconds — a provider that misses its deadline contributes nothing to the turn
 _DEPTH_TOOLS ={
-    "quick": {"tavily": 3 ,"arxiv":False, "wikipedia":False},
-    "standard": {"tavily": 5 ,"arxiv":True, "wikipedia":True},
-    "deep": {"tavily": 7 ,"arxiv":True, "wikipedia":True},
+    "quick": {"tavily": 3 ,"arxiv":False, "wikipedia":False,
+              "timeouts": {"tavily": 8}},
+    "standard": {"tavily": 5 ,"arxiv":True, "wikipedia":True,
+                 "timeouts": {"tavily": 10, "arxiv": 15, "wikipedia": 8}},
+    "deep": {"tavily": 7 ,"arxiv":True, "wikipedia":True,
+             "timeouts": {"tavily": 15, "arxiv": 20, "wikipedia": 10}},
 }
 
-def research_node(state:ReasearchState)->dict:
-    depth = state.get("depth","standard")
-    tool_config = _DEPTH_TOOLS[depth]
-    iteration = state.get("research_iterations",0) 
-    sub_questions = state.get("sub_questions",[])
-    
-    #each call to researcher handles one sub sub-questions (indexeed by iterations)
-    #if we've exhuasted sub_questions do a sirect search on gaps_ideentified in previous iterations
-    gaps = state.get("gaps_identified",[])
-    if iteration <len(sub_questions):
-        current_query = sub_questions[iteration]
-    elif gaps:
-        current_query = gaps[0] 
-    else:
-        current_query = state["query"] #fallback to original query if no sub-questions or gaps left
+# arxiv has no async client — arun_tools runs it on the shared tool pool instead
+_SYNC_TOOLS = {"tavily": tavily_search, "arxiv": arxiv_search, "wikipedia": wikipedia_search}
+_ASYNC_TOOLS = {"tavily": atavily_search, "arxiv": arxiv_search, "wikipedia": awikipedia_search}
+
+def _tool_calls(current_query:str,tool_config:dict,tools:dict)->dict:
+    """Every enabled tool for one query, in the (fn, kwargs, timeout, fallback) shape run_tools takes."""
+    timeouts = tool_config["timeouts"]
+    calls = {"tavily": (tools["tavily"], {"query": current_query, "max_results": tool_config["tavily"]}, timeouts["tavily"], [])}
+    if tool_config["arxiv"]:
+        calls["arxiv"] = (tools["arxiv"], {"query": current_query, "max_results": 2}, timeouts["arxiv"], [])
+    if tool_config["wikipedia"]:
+        calls["wikipedia"] = (tools["wikipedia"], {"query": current_query}, timeouts["wikipedia"], {})
+    return calls
+
+def _collect(current_query:str,results:dict,timed_out:list[str])->tuple[list[str],list[str]]:
+    """Returns (findings, sources) for this query only — callers append them to state via reducers.
+    Each finding carries its own URLs so dedup can merge them when two findings collapse into one."""
+    if timed_out:
+        print(f"[RESEARCHER] timed out: {timed_out} for: {current_query[:60]}")
         
     findings = []
-    sources = list(state.get("sources",[]))
+    sources = []
     
     #-------Tavily web search --------
-    web_results = tavily_search(current_query, max_results=tool_config["tavily"])
-    for r in web_results:
+    for r in results["tavily"]:
+        urls = [r["url"]] if r.get("url") else []
         if r.get("content"):
-            findings.append(f"[Web] {r['title']}: {r['content'][:400]}")  
-        if r.get("url"):
-            sources.append(r["url"])
+            findings.append(with_sources(f"[Web] {r['title']}: {r['content'][:400]}", urls))
+        sources.extend(urls)
             
     #------- ArXiv paper search --------
-    if tool_config["arxiv"]:
-        papers = arxiv_search(current_query, max_results=2)
-        for p in papers:
-            if p.get("summary"):
-                    findings.append(f"[ArXiv] {p['title']} ({p.get('published','')}) — {p['summary']}")
-            if p.get("pdf_url"):
-                sources.append(p["pdf_url"])
+    for p in results.get("arxiv", []):
+        urls = [p["pdf_url"]] if p.get("pdf_url") else []
+        if p.get("summary"):
+                findings.append(with_sources(f"[ArXiv] {p['title']} ({p.get('published','')}) — {p['summary']}", urls))
+        sources.extend(urls)
 
     #------- Wikipedia search --------
-    if tool_config["wikipedia"]:
-        wiki_result = wikipedia_search(current_query)
-        if wiki_result.get("summary"):
-            findings.append(f"[Wikipedia] {wiki_result['title']}: {wiki_result['summary']}")
-        if wiki_result.get("url"):
-            sources.append(wiki_result["url"])
-            
-            
+    wiki_result = results.get("wikipedia", {})
+    urls = [wiki_result["url"]] if wiki_result.get("url") else []
+    if wiki_result.get("summary"):
+        findings.append(with_sources(f"[Wikipedia] {wiki_result['title']}: {wiki_result['summary']}", urls))
+    sources.extend(urls)
+    return findings, sources
+
+def _search_all(current_query:str,tool_config:dict)->tuple[list[str],list[str]]:
+    """Runs every enabled tool for one query, concurrently. Findings come back as store refs."""
+    results, timed_out = run_tools(_tool_calls(current_query, tool_config, _SYNC_TOOLS))
+    findings, sources = _collect(current_query, results, timed_out)
+    return store_findings(findings), sources
+
+async def _asearch_all(current_query:str,tool_config:dict)->tuple[list[str],list[str]]:
+    results, timed_out = await arun_tools(_tool_calls(current_query, tool_config, _ASYNC_TOOLS))
+    findings, sources = _collect(current_query, results, timed_out)
+    return await asyncio.to_thread(store_findings, findings), sources
+
+# ── Speculative search ───────────────────────────────────────────────────────
+# build_graph(speculative=True): the planner starts Tavily (and Wikipedia, at depths that use it)
+# on the raw query before its own LLM call, so the network works through planning and the
+# supervisor hop instead of sitting idle. The first research turn claims the results and merges
+# them with its own. Pending work is process-local, keyed by thread_id — a job resumed elsewhere
+# simply goes without, and whatever is never claimed is cancelled and counted.
+
+_SPECULATIVE_TOOLS = ("tavily", "wikipedia")
+_SPECULATIVE_TTL_SECONDS = 600  # unclaimed entries older than this belong to jobs that died early
+_speculative: dict[str, dict] = {}  # thread_id -> {query, calls, pending, started, is_async}
+_speculative_lock = threading.Lock()
+
+def _thread_id(config:RunnableConfig | None)->str | None:
+    return ((config or {}).get("configurable") or {}).get("thread_id")
+
+def _speculative_calls(query:str,depth:str,tools:dict)->dict:
+    calls = _tool_calls(query, _DEPTH_TOOLS.get(depth, _DEPTH_TOOLS["standard"]), tools)
+    return {name: call for name, call in calls.items() if name in _SPECULATIVE_TOOLS}
+
+def _drop_speculative(entry:dict)->None:
+    # finished but unclaimed is "unused", still running is "cancelled"
+    if entry["is_async"]:
+        done = {name: entry["pending"].done() for name in entry["calls"]}
+        entry["pending"].cancel()
+    else:
+        futures, _ = entry["pending"]
+        done = {name: future.done() for name, future in futures.items()}
+        for future in futures.values():
+            future.cancel()
+    for name, finished in done.items():
+        SPECULATIVE_CALLS.inc(tool=name, outcome="unused" if finished else "cancelled")
+
+def _register_speculative(thread_id:str,entry:dict)->None:
+    now = time.monotonic()
+    with _speculative_lock:
+        stale = [k for k, e in _speculative.items() if k == thread_id or now - e["started"] > _SPECULATIVE_TTL_SECONDS]
+        dropped = [_speculative.pop(k) for k in stale]
+        _speculative[thread_id] = entry
+    for old in dropped:
+        _drop_speculative(old)
+
+def start_speculative_search(config:RunnableConfig,query:str,depth:str)->None:
+    thread_id = _thread_id(config)
+    if not thread_id:
+        return
+    calls = _speculative_calls(query, depth, _SYNC_TOOLS)
+    _register_speculative(thread_id, {
+        "query": query, "calls": calls, "pending": submit_tools(calls), "started": time.monotonic(), "is_async": False,
+    })
+
+def astart_speculative_search(config:RunnableConfig,query:str,depth:str)->None:
+    """Async-graph variant — must be called on the running loop; the searches run as one task."""
+    thread_id = _thread_id(config)
+    if not thread_id:
+        return
+    calls = _speculative_calls(query, depth, _ASYNC_TOOLS)
+    _register_speculative(thread_id, {
+        "query": query, "calls": calls, "pending": asyncio.ensure_future(arun_tools(calls)), "started": time.monotonic(), "is_async": True,
+    })
+
+def discard_speculative_search(thread_id:str)->None:
+    """Called when a job ends — cancels and counts searches its researcher never claimed."""
+    with _speculative_lock:
+        entry = _speculative.pop(thread_id, None)
+    if entry:
+        _drop_speculative(entry)
+
+def _pop_speculative(config:RunnableConfig | None,is_async:bool)->dict | None:
+    thread_id = _thread_id(config)
+    if not thread_id:
+        return None
+    with _speculative_lock:
+        entry = _speculative.get(thread_id)
+        if entry is None or entry["is_async"] != is_async:
+            return None
+        return _speculative.pop(thread_id)
+
+def _speculative_result(entry:dict,results:dict,timed_out:list[str],sources:list[str])->tuple[list[str],list[str]]:
+    """Speculative (findings, sources) not already covered by the researcher's own `sources`."""
+    SPECULATIVE_HEAD_START.observe(time.monotonic() - entry["started"])
+    for name in entry["calls"]:
+        outcome = "timed_out" if name in timed_out else "used" if results.get(name) else "empty"
+        SPECULATIVE_CALLS.inc(tool=name, outcome=outcome)
+    findings, spec_sources = _collect(entry["query"], results, timed_out)
+    seen = set(sources)
+    merged = []
+    for finding in findings:
+        _, urls = split_sources(finding)
+        if not urls or not seen.issuperset(urls):
+            merged.append(finding)
+    SPECULATIVE_FINDINGS.inc(len(merged), outcome="merged")
+    SPECULATIVE_FINDINGS.inc(len(findings) - len(merged), outcome="redundant")
+    return merged, [u for u in spec_sources if u not in seen]
+
+def _claim_speculative(config:RunnableConfig | None,findings:list[str],sources:list[str])->tuple[list[str],list[str]]:
+    entry = _pop_speculative(config, is_async=False)
+    if entry is None:
+        return findings, sources
+    results, timed_out = gather_tools(entry["calls"], entry["pending"])  # usually finished by now
+    extra, extra_sources = _speculative_result(entry, results, timed_out, sources)
+    return findings + store_findings(extra), sources + extra_sources
+
+async def _aclaim_speculative(config:RunnableConfig | None,findings:list[str],sources:list[str])->tuple[list[str],list[str]]:
+    entry = _pop_speculative(config, is_async=True)
+    if entry is None:
+        return findings, sources
+    results, timed_out = await entry["pending"]
+    extra, extra_sources = _speculative_result(entry, results, timed_out, sources)
+    return findings + await asyncio.to_thread(store_findings, extra), sources + extra_sources
+
+def _current_query(state:ReasearchState)->str:
+    iteration = state.get("research_iterations",0) 
+    sub_questions = state.get("sub_questions",[])
+    
+    #each call to researcher handles one sub sub-questions (indexeed by iterations)
+    #if we've exhuasted sub_questions do a sirect search on gaps_ideentified in previous iterations
+    gaps = state.get("gaps_identified",[])
+    if iteration <len(sub_questions):
+        return sub_questions[iteration]
+    elif gaps:
+        return gaps[0] 
+    return state["query"] #fallback to original query if no sub-questions or gaps left
+
+def _result(state:ReasearchState,current_query:str,findings:list[str],sources:list[str])->dict:
+    iteration = state.get("research_iterations",0)
+    #research_findings and sources are append reducers — return only what this turn found
     return{
-        "research_findings": state.get("research_findings",[])+findings,
+        "research_findings": findings,
         "research_iterations": iteration +1,
         "sources": sources,
         "messages":[AIMessage(content=f"Researcher: completed iteration {iteration+1} for query: '{current_query[:60]}' with {len(findings)} findings.")]
-    }
\ No newline at end of file
+    }
+
+def research_node(state:ReasearchState,config:RunnableConfig)->dict:
+    current_query = _current_query(state)
+    findings, sources = _search_all(current_query, _DEPTH_TOOLS[state.get("depth","standard")])
+    findings, sources = _claim_speculative(config, findings, sources)
+    return _result(state, current_query, findings, sources)
+
+async def aresearch_node(state:ReasearchState,config:RunnableConfig)->dict:
+    current_query = _current_query(state)
+    findings, sources = await _asearch_all(current_query, _DEPTH_TOOLS[state.get("depth","standard")])
+    findings, sources = await _aclaim_speculative(config, findings, sources)
+    return _result(state, current_query, findings, sources)
+
+# ── Fan-out mode ─────────────────────────────────────────────────────────────
+# Registered as "researcher" when build_graph(fan_out=True). Instead of one question per
+# supervisor round trip, every pending question is researched in its own parallel branch
+# and the reducers on research_findings/sources merge the results.
+# The dispatcher does no I/O, so the async graph registers it unchanged.
+
+def research_fan_out_node(state:ReasearchState,config:RunnableConfig)->Command:
+    iteration = state.get("research_iterations",0)
+    sub_questions = state.get("sub_questions",[])
+    gaps = state.get("gaps_identified",[])
+    
+    #first round covers every sub-question, later rounds cover every gap the critic found
+    if iteration == 0 and sub_questions:
+        questions = sub_questions
+    elif gaps:
+        questions = gaps
+    else:
+        questions = [state["query"]]
+        
+    depth = state.get("depth","standard")
+    branches = [{"depth": depth, "current_query": q} for q in questions]
+    if iteration == 0:
+        branches[0]["thread_id"] = _thread_id(config)  # one branch claims the speculative search, if any
+    return Command(
+        goto=[Send("research_branch", branch) for branch in branches],
+        #only the dispatcher bumps the counter — branches writing a plain channel concurrently would conflict
+        update={
+            "research_iterations": iteration +1,
+            "messages":[AIMessage(content=f"Researcher: fanning out iteration {iteration+1} across {len(questions)} question(s).")],
+        },
+    )
+
+def _branch_result(current_query:str,findings:list[str],sources:list[str])->dict:
+    return{
+        "research_findings": findings,
+        "sources": sources,
+        "messages":[AIMessage(content=f"Researcher: branch '{current_query[:60]}' returned {len(findings)} findings.")]
+    }
+
+def research_branch_node(branch:dict)->dict:
+    """One parallel branch of the fan-out. `branch` is the Send payload, not the full state."""
+    tool_config = _DEPTH_TOOLS[branch.get("depth","standard")]
+    findings, sources = _search_all(branch["current_query"], tool_config)
+    if branch.get("thread_id"):
+        findings, sources = _claim_speculative({"configurable": {"thread_id": branch["thread_id"]}}, findings, sources)
+    return _branch_result(branch["current_query"], findings, sources)
+
+async def aresearch_branch_node(branch:dict)->dict:
+    tool_config = _DEPTH_TOOLS[branch.get("depth","standard")]
+    findings, sources = await _asearch_all(branch["current_query"], tool_config)
+    if branch.get("thread_id"):
+        findings, sources = await _aclaim_speculative({"configurable": {"thread_id": branch["thread_id"]}}, findings, sources)
+    return _branch_result(branch["current_query"], findings, sources)
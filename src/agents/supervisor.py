@@ -1,10 +1,16 @@
-from langchain_groq import ChatGroq
 from langchain_core.messages import SystemMessage,HumanMessage
 from langgraph.types import Command
 from src.graph.state import ReasearchState
+from src.agents.llm_cache import invoke_cached, ainvoke_cached
+from src.clients import get_llm
 import os
 
 AGENTS = ['planner','researcher','critic','writer','FINISH']
+_MAX_ITERATIONS = 3
+
+# LLM routing only runs for states the rules below can't decide. Set to false to never call it
+# (undecidable states then go to the writer, same as an unparseable LLM answer).
+_LLM_FALLBACK = os.getenv("ARGUS_SUPERVISOR_LLM_FALLBACK", "true").lower() in ("1", "true", "yes")
 
 _SYSTEM_PROMPT = """You are a reasech supervisor. Given the current reasearch state, you will decide which agent to call next.
 
@@ -20,17 +26,31 @@ Respond with only one of these words :planner ,researcher,critic,writer,FINISH
 """
 
 
-def supervisor_node(state:ReasearchState)->Command:
-    #hard coded safety :never loop more than 3 times regardless of llm decision
-    if state.get("research_iterations",0)>=3 and not state.get("final_report"):
-        return Command(goto="writer")
+def _route_by_rules(state:ReasearchState)->str | None:
+    """The routing rules from _SYSTEM_PROMPT evaluated directly against state.
+    Returns an entry of AGENTS, or None when the state doesn't carry enough to decide.
+    """
     if state.get("final_report"):
-        return Command(goto="__end__")
-    llm = ChatGroq(
-        model="llama-3.3-70b-versatile",
-        api_key=os.getenv("GROQ_API_KEY"),
-        temperature=0,
-    )
+        return "FINISH"
+    if not state.get("sub_questions"):
+        return "planner"
+    if not state.get("research_findings"):
+        return "researcher"
+    iterations = state.get("research_iterations",0)
+    if iterations >= _MAX_ITERATIONS:
+        return "writer"
+    # "gaps empty -> critic" alone can't tell "critic not run yet" from "critic said NO_GAPS";
+    # reviewed_iterations (set by the critic) can. Checkpoints from before it existed fall back.
+    reviewed = state.get("reviewed_iterations")
+    if reviewed is None:
+        return None
+    if reviewed < iterations:
+        return "critic"
+    if state.get("gaps_identified"):
+        return "researcher"
+    return "writer"
+
+def _llm_messages(state:ReasearchState)->list:
     state_summary = f"""
         query: {state.get('query')}
         sub_questions set: {bool(state.get('sub_questions'))}
@@ -39,15 +59,48 @@ def supervisor_node(state:ReasearchState)->Command:
         research_iterations: {state.get('research_iterations', 0)}
         final_report ready: {bool(state.get('final_report'))}
         """
-        
-    response = llm.invoke([
+    return [
         SystemMessage(content=_SYSTEM_PROMPT),
         HumanMessage(content=state_summary)
-    ])
-    
-    next_agent = response.content.strip().lower()
+    ]
+
+def _parse_llm(content:str)->str:
+    next_agent = content.strip().lower()
     if next_agent not in AGENTS:
         next_agent = "writer" #safe fallback
-    
+    return next_agent
+
+def _route_without_llm(state:ReasearchState)->tuple[str, str] | None:
+    """(next_agent, path) from the guard or the rules; None means the LLM has to decide."""
+    #hard coded safety :never loop more than 3 times regardless of llm decision
+    if state.get("research_iterations",0)>=_MAX_ITERATIONS and not state.get("final_report"):
+        return "writer", "guard"
+    next_agent = _route_by_rules(state)
+    if next_agent is not None:
+        return next_agent, "rules"
+    if not _LLM_FALLBACK:
+        return "writer", "default"
+    return None
+
+def _command(next_agent:str,path:str)->Command:
+    next_agent = next_agent.lower()
     goto = "__end__" if next_agent == "finish" else next_agent
-    return Command(goto=goto , update={"next_agent": next_agent})
\ No newline at end of file
+    return Command(goto=goto , update={
+        "next_agent": next_agent,
+        "routing_log": [{"next_agent": next_agent, "path": path}],  # which path made each decision, surfaced in the job result
+    })
+
+
+def supervisor_node(state:ReasearchState)->Command:
+    decision = _route_without_llm(state)
+    if decision is None:
+        response = invoke_cached(get_llm(temperature=0), _llm_messages(state), node="supervisor", bypass=state.get("bypass_llm_cache", False))
+        decision = _parse_llm(response.content), "llm"
+    return _command(*decision)
+
+async def asupervisor_node(state:ReasearchState)->Command:
+    decision = _route_without_llm(state)
+    if decision is None:
+        response = await ainvoke_cached(get_llm(temperature=0), _llm_messages(state), node="supervisor", bypass=state.get("bypass_llm_cache", False))
+        decision = _parse_llm(response.content), "llm"
+    return _command(*decision)
@@ -1,7 +1,17 @@
+import asyncio
 import os
-from langchain_groq import ChatGroq
+import time
 from langchain_core.messages import SystemMessage, HumanMessage, AIMessage
+from langchain_core.runnables import RunnableConfig
 from src.graph.state import ReasearchState
+from src.persistence.db import load_findings, save_partial_report
+from src.agents.findings import prepare_findings
+from src.agents.llm_cache import stream_cached, astream_cached
+from src.clients import get_llm
+
+# The report is streamed and the text so far written to jobs.partial_report every
+# _FLUSH_SECONDS, so GET /jobs/{id}/result shows it growing instead of nothing until the end.
+_FLUSH_SECONDS = float(os.getenv("ARGUS_REPORT_FLUSH_INTERVAL", "1.0"))
 
 _SYSTEM_PROMPT = """You are an expert research report writer. Synthesize the provided research findings into a 
 comprehensive, well-structured markdown report.
@@ -35,22 +45,16 @@ Rules:
 """
 
 
-def writer_node(state: ReasearchState) -> dict:
-    llm = ChatGroq(
-        model="llama-3.3-70b-versatile",
-        api_key=os.getenv("GROQ_API_KEY"),
-        temperature=0.2,    # slight creativity for good prose, low enough to stay accurate
-    )
-
+def _messages(state: ReasearchState, findings: list[str]) -> list:
     # Deduplicate sources and number them
     sources = list(dict.fromkeys(state.get("sources", [])))  # preserves order, removes dupes
     sources_text = "\n".join(f"[{i+1}] {url}" for i, url in enumerate(sources))
 
-    findings_text = "\n\n".join(state.get("research_findings", []))
+    findings_text = "\n\n".join(findings)
 
     synthesis_prompt = f"""Research query: {state['query']}
 
-Research findings:
+Research findings (each ends with the URLs it came from):
 {findings_text}
 
 Available sources for citation:
@@ -58,13 +62,54 @@ Available sources for citation:
 
 Write the complete research report now."""
 
-    response = llm.invoke([
+    return [
         SystemMessage(content=_SYSTEM_PROMPT),
         HumanMessage(content=synthesis_prompt),
-    ])
+    ]
 
+def _result(content: str, dedup: dict) -> dict:
     return {
-        "final_report": response.content,
-        "sources": sources,
+        "final_report": content,
+        "dedup_log": [dedup],
+        # sources is an append reducer — returning the deduped list here would double it
         "messages": [AIMessage(content="Writer: final report complete.")],
-    }
\ No newline at end of file
+    }
+
+
+def _job_id(config: RunnableConfig | None) -> str | None:
+    # the API runs each job on thread_id=job_id; without one there is no row to write partials to
+    return ((config or {}).get("configurable") or {}).get("thread_id")
+
+
+def writer_node(state: ReasearchState, config: RunnableConfig) -> dict:
+    # slight creativity for good prose, low enough to stay accurate
+    llm = get_llm(temperature=0.2)
+    # deduped, ranked and packed into the depth's token budget — overflow is condensed, not dropped
+    findings, dedup = prepare_findings("writer", state, load_findings(state.get("research_findings", [])), llm.model_name)
+    job_id = _job_id(config)
+    parts, last_flush = [], time.monotonic()
+    for delta in stream_cached(llm, _messages(state, findings), node="writer", bypass=state.get("bypass_llm_cache", False)):
+        parts.append(delta)
+        if job_id and time.monotonic() - last_flush >= _FLUSH_SECONDS:
+            save_partial_report(job_id, "".join(parts))
+            last_flush = time.monotonic()
+    report = "".join(parts)
+    if job_id:
+        save_partial_report(job_id, report)  # readers see the whole report before the job's final write
+    return _result(report, dedup)
+
+async def awriter_node(state: ReasearchState, config: RunnableConfig) -> dict:
+    llm = get_llm(temperature=0.2)
+    findings = await asyncio.to_thread(load_findings, state.get("research_findings", []))
+    findings, dedup = prepare_findings("writer", state, findings, llm.model_name)
+    job_id = _job_id(config)
+    parts, last_flush = [], time.monotonic()
+    async for delta in astream_cached(llm, _messages(state, findings), node="writer", bypass=state.get("bypass_llm_cache", False)):
+        parts.append(delta)
+        if job_id and time.monotonic() - last_flush >= _FLUSH_SECONDS:
+            await asyncio.to_thread(save_partial_report, job_id, "".join(parts))
+            last_flush = time.monotonic()
+    report = "".join(parts)
+    if job_id:
+        await asyncio.to_thread(save_partial_report, job_id, report)
+    return _result(report, dedup)
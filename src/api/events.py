@@ -0,0 +1,54 @@
+import asyncio
+import threading
+from collections import OrderedDict
+
+TERMINAL_EVENTS = ("complete", "failed")
+_KEEP_FINISHED = 200  # finished jobs whose history stays replayable for late subscribers
+
+
+class JobEventBus:
+    """Fan-out of per-job progress events from worker threads to SSE subscribers.
+    Publishers run on JobScheduler threads; subscribers are asyncio queues, fed through
+    loop.call_soon_threadsafe. Every event is also kept in the job's history so a client
+    that connects mid-run (or just after) gets the full sequence.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._history: dict[str, list[dict]] = {}
+        # finished jobs in finish order — only these are evicted, a long-running job keeps its history
+        self._finished: OrderedDict[str, None] = OrderedDict()
+        self._subscribers: dict[str, list[tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+
+    def publish(self, job_id: str, event: dict) -> None:
+        with self._lock:
+            self._history.setdefault(job_id, []).append(event)
+            subscribers = list(self._subscribers.get(job_id, []))
+            if event["event"] in TERMINAL_EVENTS:
+                self._finished[job_id] = None
+                self._finished.move_to_end(job_id)
+                while len(self._finished) > _KEEP_FINISHED:
+                    oldest, _ = self._finished.popitem(last=False)
+                    self._history.pop(oldest, None)
+        for loop, q in subscribers:
+            loop.call_soon_threadsafe(q.put_nowait, event)
+
+    def subscribe(self, job_id: str) -> tuple[list[dict], asyncio.Queue]:
+        """Returns (events so far, queue of future events). Call from the event loop."""
+        q: asyncio.Queue = asyncio.Queue()
+        with self._lock:
+            history = list(self._history.get(job_id, []))
+            self._subscribers.setdefault(job_id, []).append((asyncio.get_running_loop(), q))
+        return history, q
+
+    def unsubscribe(self, job_id: str, q: asyncio.Queue) -> None:
+        with self._lock:
+            remaining = [s for s in self._subscribers.get(job_id, []) if s[1] is not q]
+            if remaining:
+                self._subscribers[job_id] = remaining
+            else:
+                self._subscribers.pop(job_id, None)
+
+
+# Single shared instance — research.py publishes, the /jobs/{id}/events route subscribes.
+event_bus = JobEventBus()
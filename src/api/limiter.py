@@ -1,7 +1,14 @@
+import os
 from slowapi import Limiter
 from slowapi.util import get_remote_address
+from src.persistence.db import DB_PATH
+import src.persistence.ratelimit  # noqa: F401 — registers the sqlite:// storage scheme
 
 # Single shared limiter instance.
 # Imported by both main.py (to attach to app.state) and research.py (for @limiter.limit decorators).
 # Creating two separate Limiter() instances breaks rate limiting — they don't share state.
-limiter = Limiter(key_func=get_remote_address)
+# Counters live in data/ratelimit.db so all uvicorn workers (and restarts) share them;
+# ARGUS_RATE_LIMIT_STORAGE takes any `limits` storage URI instead (memory://, redis://...).
+_STORAGE_URI = os.getenv("ARGUS_RATE_LIMIT_STORAGE", f"sqlite:///{DB_PATH.parent.resolve() / 'ratelimit.db'}")
+
+limiter = Limiter(key_func=get_remote_address, storage_uri=_STORAGE_URI)
@@ -1,3 +1,4 @@
+import asyncio
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -8,17 +9,77 @@ from slowapi.errors import RateLimitExceeded
 from src.api.limiter import limiter          # shared instance
 from src.api.routes.research import router as research_router
 from src.api.routes.health import router as health_router
-from src.persistence.db import _get_conn  # triggers table creation on startup
+from src.api.routes.stats import router as stats_router
+from src.api.routes.metrics import router as metrics_router
+from src.api.scheduler import scheduler, ASYNC_GRAPH
+from src.api.routes.research import init_async_graph, resume_interrupted_jobs
+from src.persistence.db import init_db, heartbeat, unregister_worker, acquire_lease, WORKER_ID, WORKER_HEARTBEAT_SECONDS
+from src.persistence.retention import compact_checkpoints, COMPACTION_INTERVAL_SECONDS
 
 load_dotenv()
 
 
+async def _compaction_loop():
+    # background checkpoint retention — sqlite work runs in a thread, never on the loop.
+    # With several workers only the one holding the lease compacts; the others retry each interval.
+    # The first run waits one interval so startup (resumed jobs, other workers booting) isn't competing with it.
+    while True:
+        await asyncio.sleep(COMPACTION_INTERVAL_SECONDS)
+        if await asyncio.to_thread(acquire_lease, "compaction", COMPACTION_INTERVAL_SECONDS * 1.5):
+            report = await asyncio.to_thread(compact_checkpoints)
+            print(f"[RETENTION] {report}")
+
+
+async def _worker_loop(adopt: bool = True):
+    # keeps this worker's jobs its own, and adopts jobs of workers that stopped heartbeating
+    delay = WORKER_HEARTBEAT_SECONDS
+    while True:
+        await asyncio.sleep(delay)
+        try:
+            await asyncio.to_thread(heartbeat)
+        except Exception as e:
+            # retry soon instead of skipping a beat — three missed intervals and the other workers
+            # adopt this one's jobs (the runners notice via owns_job and stop)
+            print(f"[WORKER] heartbeat failed, retrying: {e}")
+            delay = min(1.0, WORKER_HEARTBEAT_SECONDS)
+            continue
+        delay = WORKER_HEARTBEAT_SECONDS
+        if not adopt:
+            continue
+        try:
+            for entry in await resume_interrupted_jobs():
+                print(f"[RESUME] adopted {entry}")
+        except Exception as e:
+            print(f"[WORKER] adopting orphaned jobs failed: {e}")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Runs once at startup - creates DB + jobs table if not exists
-    _get_conn()
+    init_db()
+    await asyncio.to_thread(heartbeat)
+    print(f"[WORKER] {WORKER_ID} started")
+    if ASYNC_GRAPH:
+        await init_async_graph()
+    scheduler.start()
+    # jobs a previous process (or a dead worker) left pending/running continue from their last checkpoint
+    for entry in await resume_interrupted_jobs():
+        print(f"[RESUME] {entry}")
+    compaction = asyncio.create_task(_compaction_loop())
+    worker = asyncio.create_task(_worker_loop())
     yield
-    # Runs at shutdown - nothing to clean up currently
+    # Runs at shutdown - let running jobs finish
+    worker.cancel()
+    compaction.cancel()
+    # keep heartbeating (adopting nothing) until they do — a deep job outlasts WORKER_STALE_SECONDS,
+    # and another worker would otherwise resume the same thread_id alongside this one
+    keepalive = asyncio.create_task(_worker_loop(adopt=False))
+    try:
+        await scheduler.stop()
+    finally:
+        keepalive.cancel()
+    # flushes buffered writes and deregisters, so queued jobs are adopted by the other workers now
+    unregister_worker()
 
 
 app = FastAPI(
@@ -40,6 +101,8 @@ app.add_middleware(
 )
 
 app.include_router(health_router)
+app.include_router(stats_router)
+app.include_router(metrics_router)
 app.include_router(research_router)
 
 
@@ -1,18 +1,27 @@
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 # _____Request model _____
 
 class ReasearchRequest(BaseModel):
     query: str
     depth : str = "standard" # quick, standard, deep
+    bypass_llm_cache: bool = False # force fresh completions instead of replaying cached ones
+    force_refresh: bool = False # always start a new job, even if an identical one is running or just finished
     
+class BatchResearchRequest(BaseModel):
+    queries: List[str]  # one job per query, all at the same depth
+    depth : str = "standard"
+    bypass_llm_cache: bool = False
+    force_refresh: bool = False
+
 # _____Response model _____
 class ReasearchJobResponse(BaseModel):
     """Returned immediately from POST /research """
     job_id: str
     status: str  
     estimated_seconds :int
+    reused: Optional[str] = None  # "in_flight" (attached to a running job) | "completed" (recent result)
     
 
 class JobStatusResponse(BaseModel):
@@ -22,14 +31,60 @@ class JobStatusResponse(BaseModel):
     created_at: str
     updated_at: str
     
+class JobSummaryResponse(BaseModel):
+    """One entry of GET /jobs — no report, see /jobs/{job_id}/result for that"""
+    job_id: str
+    query: str
+    depth: str
+    status: str
+    agent_turns: Optional[int] = None
+    error: Optional[str] = None
+    created_at: str
+    updated_at: str
+
+
+class JobListResponse(BaseModel):
+    """Returned from GET /jobs, newest first"""
+    jobs: List[JobSummaryResponse]
+    next_cursor: Optional[str] = None  # pass as ?cursor= for the next page; null on the last page
+
+
 class JobResultResponse(BaseModel):
     """Returned from GET /jobs/{job_id}/result """
     job_id: str
     query: str
     status: str
     report: Optional[str] = None
+    partial: bool = False  # report is the writer's output so far — the job is still running
     sources: Optional[List[str]] = None
+    routing: Optional[List[dict]] = None  # [{next_agent, path: rules|llm|guard|default}, ...]
+    dedup: Optional[List[dict]] = None  # [{node, input, kept, duplicates_removed, ..., token_budget, packed, condensed, omitted}, ...] — critic entries add decided_by (coverage|llm) and coverage
     agent_turns: Optional[int] = None
     error: Optional[str] = None
     created_at: str
-    updated_at: str
\ No newline at end of file
+    updated_at: str
+
+
+class BatchJobResponse(BaseModel):
+    """Returned immediately from POST /research/batch"""
+    batch_id: str
+    job_ids: List[str]  # same order as the submitted queries
+    status: str
+    reused: int  # queries answered by an identical running/recent job instead of a new run
+    estimated_seconds: int
+
+
+class BatchStatusResponse(BaseModel):
+    """Returned from GET /batches/{batch_id}/status"""
+    batch_id: str
+    status: str  # pending, running, complete, partial (some failed), failed
+    total: int
+    counts: Dict[str, int]  # jobs per status
+    jobs: List[dict]  # [{job_id, query, status}, ...]
+
+
+class BatchResultResponse(BaseModel):
+    """Returned from GET /batches/{batch_id}/result"""
+    batch_id: str
+    status: str
+    results: List[JobResultResponse]
@@ -0,0 +1,14 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from src.api.scheduler import scheduler
+from src import metrics
+
+router = APIRouter()
+
+## Prometheus scrape target — counters and histograms are per process, like GET /stats
+@router.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    stats = scheduler.stats()
+    metrics.QUEUE_DEPTH.set(stats["queue_depth"])
+    metrics.JOBS_RUNNING.set(stats["running"])
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
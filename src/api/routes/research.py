@@ -1,76 +1,522 @@
+import os
+import math
 import uuid
 import json
-from fastapi import APIRouter, BackgroundTasks, HTTPException, Request
-from src.api.models import ReasearchRequest, ReasearchJobResponse, JobStatusResponse, JobResultResponse
-from src.persistence.db import create_job, update_job_status, get_job
+import base64
+import binascii
+import asyncio
+import threading
+import time
+from contextlib import aclosing
+from collections import deque
+from datetime import datetime, timezone
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from src.api.models import (
+    ReasearchRequest, ReasearchJobResponse, JobStatusResponse, JobResultResponse, JobSummaryResponse, JobListResponse,
+    BatchResearchRequest, BatchJobResponse, BatchStatusResponse, BatchResultResponse,
+)
+from src.persistence.db import (
+    create_job, update_job_status, owns_job, get_job, get_job_summary, list_jobs, find_recent_result, claim_orphaned_jobs,
+    create_batch, get_batch_jobs, WORKER_ID, WORKER_STALE_SECONDS,
+)
+from src.tools.cache import normalize_query
 from src.graph.pipeline import build_graph
+from src.agents.researcher import discard_speculative_search
+from src.persistence.checkpointer import get_async_checkpointer
 from src.api.limiter import limiter          # shared instance — must match app.state.limiter
+from src.api.scheduler import scheduler, QueueFullError, DEPTH_PRIORITY, ASYNC_GRAPH
+from src.api.events import event_bus, TERMINAL_EVENTS
+from src.metrics import JOB_DURATION
 
 #build graph once at module load -not per request 
 router = APIRouter()
-_graph = build_graph()   # built once at module load, not per request
+_graph = None if ASYNC_GRAPH else build_graph()   # built once at module load, not per request
+_agraph = None   # async graph — built by init_async_graph() once the event loop is running
 _DEPTH_ESTIMATES = {
     "quick": 20,
     "standard": 45,
     "deep": 90
 }
+_SSE_KEEPALIVE_SECONDS = 15
+_SSE_REMOTE_POLL_SECONDS = 2  # status poll for jobs another worker runs (its events never reach this bus)
 
-def _run_research(job_id:str,query:str,depth:str)->None:
-    """Runs synchronously in a thread pool thread.
-    Writes status updates to SQlite throghout
+# Identical requests (normalized query + depth) attach to the job already running for them, and a
+# completed result younger than _REUSE_WINDOW_SECONDS is served as-is. force_refresh skips both.
+_REUSE_WINDOW_SECONDS = float(os.getenv("ARGUS_RESULT_REUSE_SECONDS", "3600"))  # 0 = never reuse results
+_inflight: dict[tuple[str,str], str] = {}  # (query_key, depth) -> job_id, jobs submitted by this process
+_creating: dict[str, threading.Event] = {}  # job_id -> set once its row is inserted; reserved keys only
+_inflight_lock = threading.Lock()  # guards both dicts — never held across sqlite I/O
+
+_submitted_at: dict[str, float] = {}  # job_id -> monotonic submit time, for argus_job_duration_seconds
+resumed_jobs: list[dict] = []  # what resume_interrupted_jobs did at startup, shown on /stats
+
+class _OwnershipLost(Exception):
+    """Another worker claimed the job mid-run (this one looked dead to it) and resumes it from the
+    same checkpoint thread — the run here stops without writing anything else."""
+
+_ADOPTED = "adopted"
+
+def _record_duration(job_id:str,depth:str,status:str,run_started:float)->None:
+    # resumed jobs have no submit time in this process — they count from when they restarted
+    if status == _ADOPTED:
+        _submitted_at.pop(job_id, None)  # the adopting worker reports this job's duration
+        return
+    JOB_DURATION.observe(time.monotonic() - _submitted_at.pop(job_id, run_started), depth=depth, status=status)
+
+def _release_inflight(query:str,depth:str,job_id:str)->None:
+    key = (normalize_query(query), depth)
+    with _inflight_lock:
+        if _inflight.get(key) == job_id:  # a forced rerun may have replaced the entry
+            del _inflight[key]
+
+def _node_event(node:str,update:dict | None)->dict:
+    """One SSE payload per node update from _graph.stream(stream_mode="updates")."""
+    update = update or {}
+    event = {"event": "node", "node": node}
+    if update.get("messages"):
+        event["message"] = update["messages"][-1].content
+    if node == "supervisor" and update.get("next_agent"):
+        event["next_agent"] = update["next_agent"]
+    return event
+
+def _initial_state(query:str,depth:str,bypass_llm_cache:bool)->dict:
+    return {
+        "query": query,
+        "depth": depth,
+        "bypass_llm_cache": bypass_llm_cache,
+        "messages": [],
+        "sub_questions": [],
+        "research_findings": [],
+        "gaps_identified": [],
+        "research_iterations": 0,
+        "reviewed_iterations": 0,
+        "final_report": "",
+        "sources": [],
+        "next_agent": "",
+        "routing_log": [],
+        "dedup_log": [],
+    }
+
+def _result(values:dict)->dict:
+    return {
+        "report": values.get("final_report", ""),
+        "sources": list(dict.fromkeys(values.get("sources", []))),  # same order the writer numbered them
+        "routing": values.get("routing_log", []),
+        "dedup": values.get("dedup_log", []),
+    }
+
+def _run_research(job_id:str,query:str,depth:str,bypass_llm_cache:bool=False,resume:bool=False)->None:
+    """Runs synchronously on a JobScheduler worker thread.
+    Writes status updates to SQlite throghout and publishes every node transition to event_bus.
+    resume=True continues from the thread's latest checkpoint instead of starting over.
     """
+    run_started = time.monotonic()
+    status = "failed"
     update_job_status(job_id,"running")
+    event_bus.publish(job_id, {"event": "status", "status": "running"})
+    config = {"configurable":{"thread_id": job_id}}
     try:
-        result = _graph.invoke({
-                "query": query,
-                "depth": depth,
-                "messages": [],
-                "sub_questions": [],
-                "research_findings": [],
-                "gaps_identified": [],
-                "research_iterations": 0,
-                "final_report": "",
-                "sources": [],
-                "next_agent": "",
-            },
-                config={"configurable":{"thread_id": job_id}},
-            )
-        update_job_status(
+        for chunk in _graph.stream(
+                None if resume else _initial_state(query, depth, bypass_llm_cache),  # None = resume from checkpoint
+                config=config,
+                stream_mode="updates",
+            ):
+            for node, update in chunk.items():
+                event_bus.publish(job_id, _node_event(node, update))
+            if not owns_job(job_id):  # each chunk is a checkpointed superstep — don't write another
+                raise _OwnershipLost
+        result = _graph.get_state(config).values
+        if not update_job_status(
             job_id,
             status="complete",
-            result={
-                "report": result.get("final_report", ""),
-                "sources": result.get("sources", []),
-            },
+            result=_result(result),
             agent_turns=result.get("research_iterations", 0)
-        )
+        ):
+            raise _OwnershipLost
+        event_bus.publish(job_id, {"event": "complete", "status": "complete"})
+        status = "complete"
+    except _OwnershipLost:
+        status = _ADOPTED
+        print(f"[WORKER] {job_id} was claimed by another worker — stopped here, it continues there")
     except Exception as e:
         update_job_status(job_id, "failed", error=str(e))
+        event_bus.publish(job_id, {"event": "failed", "status": "failed", "error": str(e)})
+    finally:
+        _release_inflight(query, depth, job_id)
+        discard_speculative_search(job_id)
+        _record_duration(job_id, depth, status, run_started)
+
+async def init_async_graph()->None:
+    """Builds the async graph inside the running loop (AsyncSqliteSaver needs it). Called from lifespan."""
+    global _agraph
+    if _agraph is None:
+        _agraph = build_graph(async_nodes=True, checkpointer=await get_async_checkpointer())
+
+async def _arun_research(job_id:str,query:str,depth:str,bypass_llm_cache:bool=False,resume:bool=False)->None:
+    """_run_research for ARGUS_ASYNC_GRAPH — runs as a task on the app's event loop.
+    SQLite job writes go to a thread so they never stall the loop.
+    """
+    run_started = time.monotonic()
+    status = "failed"
+    await asyncio.to_thread(update_job_status, job_id, "running")
+    event_bus.publish(job_id, {"event": "status", "status": "running"})
+    config = {"configurable":{"thread_id": job_id}}
+    try:
+        # aclosing: when the run stops early (_OwnershipLost) the stream's pending checkpoint
+        # writes are wound down here, not whenever the loop gets round to finalizing the generator
+        async with aclosing(_agraph.astream(
+                None if resume else _initial_state(query, depth, bypass_llm_cache),
+                config=config,
+                stream_mode="updates",
+            )) as stream:
+            async for chunk in stream:
+                for node, update in chunk.items():
+                    event_bus.publish(job_id, _node_event(node, update))
+                if not await asyncio.to_thread(owns_job, job_id):
+                    raise _OwnershipLost
+        result = (await _agraph.aget_state(config)).values
+        if not await asyncio.to_thread(
+            update_job_status,
+            job_id,
+            status="complete",
+            result=_result(result),
+            agent_turns=result.get("research_iterations", 0),
+        ):
+            raise _OwnershipLost
+        event_bus.publish(job_id, {"event": "complete", "status": "complete"})
+        status = "complete"
+    except _OwnershipLost:
+        status = _ADOPTED
+        print(f"[WORKER] {job_id} was claimed by another worker — stopped here, it continues there")
+    except Exception as e:
+        await asyncio.to_thread(update_job_status, job_id, "failed", error=str(e))
+        event_bus.publish(job_id, {"event": "failed", "status": "failed", "error": str(e)})
+    finally:
+        _release_inflight(query, depth, job_id)
+        discard_speculative_search(job_id)
+        _record_duration(job_id, depth, status, run_started)
+
+async def resume_interrupted_jobs()->list[dict]:
+    """Called from lifespan once the scheduler is running, then on every worker heartbeat. Jobs a
+    dead worker (or a previous process) left pending or running are claimed by this one and put
+    back on the scheduler: from their latest checkpoint if they have one (the planner/search/LLM
+    steps already done are skipped), from scratch if they never started.
+    Returns one {job_id, resumed_from, skipped_steps} entry per job.
+    """
+    report = []
+    for job in await asyncio.to_thread(claim_orphaned_jobs, WORKER_STALE_SECONDS):
+        job_id = job["job_id"]
+        config = {"configurable":{"thread_id": job_id}}
+        snapshot = await _agraph.aget_state(config) if ASYNC_GRAPH else await asyncio.to_thread(_graph.get_state, config)
+        entry = {"job_id": job_id, "resumed_from": "start", "skipped_steps": 0}
+        if snapshot.values and not snapshot.next:
+            # the graph finished but the process died before the terminal status write
+            values = snapshot.values
+            await asyncio.to_thread(
+                update_job_status, job_id, "complete", result=_result(values), agent_turns=values.get("research_iterations", 0)
+            )
+            report.append({**entry, "resumed_from": "finished", "skipped_steps": snapshot.metadata.get("step", 0)})
+            continue
+        resume = bool(snapshot.values)
+        if resume:
+            entry.update(resumed_from="checkpoint", skipped_steps=snapshot.metadata.get("step", 0))
+        bypass = bool(snapshot.values.get("bypass_llm_cache", False)) if resume else False
+        # unbounded: a restart can leave a whole batch backlog pending, and these jobs were already accepted
+        scheduler.submit(
+            _arun_research if ASYNC_GRAPH else _run_research,
+            job_id,
+            job["query"],
+            job["depth"],
+            bypass,
+            resume,
+            priority=DEPTH_PRIORITY.get(job["depth"], 1),
+            bounded=False,
+        )
+        with _inflight_lock:
+            _inflight[(normalize_query(job["query"]), job["depth"])] = job_id
+        event_bus.publish(job_id, {"event": "resumed", **entry})
+        report.append(entry)
+    resumed_jobs.extend(report)
+    return report
+
+def _in_flight_job(key:tuple[str,str])->str | None:
+    """The job already registered for key, once its row exists — a reservation still being inserted
+    is waited out; if that insert failed the key is free again and this returns None."""
+    while True:
+        with _inflight_lock:
+            job_id = _inflight.get(key)
+            created = _creating.get(job_id)
+        if created is None:
+            return job_id
+        created.wait()
+
+def _reuse_or_create(query:str,depth:str,bypass_llm_cache:bool,force_refresh:bool)->tuple[str,str | None]:
+    """Returns (job_id, reused). reused is "completed" or "in_flight" when an identical job answers
+    the request, None when a new pending job was created — the caller must then submit it."""
+    query_key = normalize_query(query)
+    key = (query_key, depth)
+    if not force_refresh:
+        in_flight = _in_flight_job(key)
+        if in_flight:
+            return in_flight, "in_flight"
+        # bypass_llm_cache asks for fresh completions — an already finished report won't do
+        if _REUSE_WINDOW_SECONDS > 0 and not bypass_llm_cache:
+            done = find_recent_result(query_key, depth, _REUSE_WINDOW_SECONDS)
+            if done:
+                return done["job_id"], "completed"
+    job_id = str(uuid.uuid4())
+    created = threading.Event()
+    while True:
+        # reserve the key before the insert so identical requests arriving meanwhile attach to this job
+        with _inflight_lock:
+            if force_refresh or key not in _inflight:
+                _inflight[key] = job_id
+                _creating[job_id] = created
+                _submitted_at[job_id] = time.monotonic()
+                break
+        in_flight = _in_flight_job(key)  # someone reserved it while we read
+        if in_flight:
+            return in_flight, "in_flight"
+    try:
+        create_job(job_id, query, depth, query_key=query_key)
+    except Exception:
+        _release_inflight(query, depth, job_id)
+        _submitted_at.pop(job_id, None)
+        raise
+    finally:
+        with _inflight_lock:
+            _creating.pop(job_id, None)
+        created.set()
+    return job_id, None
+
+def _reject(job_id:str,query:str,depth:str)->None:
+    _release_inflight(query, depth, job_id)
+    _submitted_at.pop(job_id, None)
+    update_job_status(job_id, "failed", error="rejected: job queue full")
 
 @router.post("/research", response_model=ReasearchJobResponse, status_code=202)
 @limiter.limit("5/hour")
-async def create_research_job(request: Request, body: ReasearchRequest, background_tasks: BackgroundTasks):
+async def create_research_job(request: Request, body: ReasearchRequest):
         if body.depth not in ("quick", "standard", "deep"):
             raise HTTPException(status_code=422, detail="depth must be 'quick', 'standard', or 'deep'")
-        job_id = str(uuid.uuid4())
-        create_job(job_id, body.query, body.depth)
-
-        # run graph in thread pool - never block the event loop
-        background_tasks.add_task(
-            _run_research,
-            job_id,
-            body.query,
-            body.depth,
+        # job-table reads/writes go to a thread: with ARGUS_ASYNC_GRAPH the checkpointer commits from
+        # this loop, so a blocking sqlite call here can wait on a write lock only the loop can release
+        job_id, reused = await asyncio.to_thread(
+            _reuse_or_create, body.query, body.depth, body.bypass_llm_cache, body.force_refresh
         )
+        if reused == "completed":
+            return ReasearchJobResponse(job_id=job_id, status="complete", estimated_seconds=0, reused=reused)
+        if reused == "in_flight":
+            job = await asyncio.to_thread(get_job_summary, job_id)
+            return ReasearchJobResponse(
+                job_id=job_id,
+                status=job["status"] if job else "pending",
+                estimated_seconds=_DEPTH_ESTIMATES.get(body.depth, 45),
+                reused=reused,
+            )
+
+        # run graph on the dedicated job workers - never block the event loop or the request threadpool
+        try:
+            scheduler.submit(
+                _arun_research if ASYNC_GRAPH else _run_research,
+                job_id,
+                body.query,
+                body.depth,
+                body.bypass_llm_cache,
+                priority=DEPTH_PRIORITY[body.depth],
+            )
+        except QueueFullError as e:
+            await asyncio.to_thread(_reject, job_id, body.query, body.depth)
+            raise HTTPException(
+                status_code=503,
+                detail="Research queue is full, try again later",
+                headers={"Retry-After": str(e.retry_after)},
+            )
         return ReasearchJobResponse(
             job_id=job_id,
             status="pending",
             estimated_seconds=_DEPTH_ESTIMATES.get(body.depth, 45),
         )
-        
+
+# ── Batches ──────────────────────────────────────────────────────────────────
+# A batch feeds its new jobs to the scheduler ARGUS_BATCH_CONCURRENCY at a time: each finished
+# job submits the next one, so a 50-query batch never floods the queue or starves single
+# requests. Tool results are shared through the process-wide tool cache and the arxiv
+# singleflight, completions through the LLM cache, and identical queries through _reuse_or_create.
+
+_BATCH_CONCURRENCY = int(os.getenv("ARGUS_BATCH_CONCURRENCY", "3"))
+_BATCH_MAX_QUERIES = int(os.getenv("ARGUS_BATCH_MAX_QUERIES", "50"))
+_batch_backlog: dict[str, deque] = {}  # batch_id -> jobs not yet handed to the scheduler
+_batch_lock = threading.Lock()
+
+def _submit_next(batch_id:str)->None:
+    with _batch_lock:
+        backlog = _batch_backlog.get(batch_id)
+        if not backlog:
+            _batch_backlog.pop(batch_id, None)
+            return
+        job_id, query, depth, bypass_llm_cache = backlog.popleft()
+    # unbounded: the batch itself caps how many of its jobs are queued
+    scheduler.submit(
+        _arun_batch_job if ASYNC_GRAPH else _run_batch_job,
+        batch_id, job_id, query, depth, bypass_llm_cache,
+        priority=DEPTH_PRIORITY[depth],
+        bounded=False,
+    )
+
+def _run_batch_job(batch_id:str,job_id:str,query:str,depth:str,bypass_llm_cache:bool)->None:
+    try:
+        _run_research(job_id, query, depth, bypass_llm_cache)
+    finally:
+        _submit_next(batch_id)
+
+async def _arun_batch_job(batch_id:str,job_id:str,query:str,depth:str,bypass_llm_cache:bool)->None:
+    try:
+        await _arun_research(job_id, query, depth, bypass_llm_cache)
+    finally:
+        _submit_next(batch_id)
+
+def _create_batch_jobs(batch_id:str,body:BatchResearchRequest)->tuple[list[str],deque,int]:
+    job_ids, backlog = [], deque()
+    reused = 0
+    for query in body.queries:
+        job_id, how = _reuse_or_create(query, body.depth, body.bypass_llm_cache, body.force_refresh)
+        job_ids.append(job_id)
+        if how:
+            reused += 1  # includes repeats within this batch — they attach to the first one
+        else:
+            backlog.append((job_id, query, body.depth, body.bypass_llm_cache))
+    create_batch(batch_id, job_ids)
+    return job_ids, backlog, reused
+
+def _batch_status(jobs:list[dict])->str:
+    statuses = [job["status"] for job in jobs]
+    if any(st not in ("complete", "failed") for st in statuses):
+        return "running" if any(st != "pending" for st in statuses) else "pending"
+    if all(st == "failed" for st in statuses):
+        return "failed"
+    return "partial" if "failed" in statuses else "complete"
+
+@router.post("/research/batch", response_model=BatchJobResponse, status_code=202)
+@limiter.limit("5/hour")
+async def create_research_batch(request: Request, body: BatchResearchRequest):
+        if body.depth not in ("quick", "standard", "deep"):
+            raise HTTPException(status_code=422, detail="depth must be 'quick', 'standard', or 'deep'")
+        if not body.queries or len(body.queries) > _BATCH_MAX_QUERIES:
+            raise HTTPException(status_code=422, detail=f"queries must hold 1 to {_BATCH_MAX_QUERIES} entries")
+        starting = min(_BATCH_CONCURRENCY, len(body.queries))
+        if scheduler.free_slots() < starting:
+            raise HTTPException(
+                status_code=503,
+                detail="Research queue is full, try again later",
+                headers={"Retry-After": str(scheduler.retry_after())},
+            )
+
+        batch_id = str(uuid.uuid4())
+        job_ids, backlog, reused = await asyncio.to_thread(_create_batch_jobs, batch_id, body)
+        # counted before _submit_next starts popping the first wave off the backlog
+        waves = math.ceil(len(backlog) / _BATCH_CONCURRENCY)
+        with _batch_lock:
+            _batch_backlog[batch_id] = backlog
+        for _ in range(starting):
+            _submit_next(batch_id)
+
+        return BatchJobResponse(
+            batch_id=batch_id,
+            job_ids=job_ids,
+            status=_batch_status(await asyncio.to_thread(get_batch_jobs, batch_id)),
+            reused=reused,
+            estimated_seconds=waves * _DEPTH_ESTIMATES.get(body.depth, 45),
+        )
+
+@router.get("/batches/{batch_id}/status", response_model=BatchStatusResponse)
+def get_batch_status(batch_id:str):
+    jobs = get_batch_jobs(batch_id)
+    if not jobs:
+        raise HTTPException(status_code=404,detail=f"Batch {batch_id} not found")
+    counts = {}
+    for job in jobs:
+        counts[job["status"]] = counts.get(job["status"], 0) + 1
+    return BatchStatusResponse(
+        batch_id=batch_id,
+        status=_batch_status(jobs),
+        total=len(jobs),
+        counts=counts,
+        jobs=[{"job_id": job["job_id"], "query": job["query"], "status": job["status"]} for job in jobs],
+    )
+
+@router.get("/batches/{batch_id}/result", response_model=BatchResultResponse)
+def get_batch_result(batch_id:str):
+    jobs = get_batch_jobs(batch_id, with_result=True)
+    if not jobs:
+        raise HTTPException(status_code=404,detail=f"Batch {batch_id} not found")
+    return BatchResultResponse(
+        batch_id=batch_id,
+        status=_batch_status(jobs),
+        results=[_job_result(job) for job in jobs],
+    )
+
+_LIST_MAX_LIMIT = 100
+
+def _encode_cursor(job:dict)->str:
+    return base64.urlsafe_b64encode(f"{job['created_at']}|{job['job_id']}".encode()).decode()
+
+def _decode_cursor(cursor:str)->tuple[str,str]:
+    try:
+        created_at, sep, job_id = base64.urlsafe_b64decode(cursor.encode()).decode().partition("|")
+    except (binascii.Error, UnicodeDecodeError):
+        sep = ""
+    if not sep:
+        raise HTTPException(status_code=422, detail="cursor is not one returned by GET /jobs")
+    return created_at, job_id
+
+def _iso(name:str,value:Optional[str])->Optional[str]:
+    # compared as text against created_at, so normalize to the same UTC isoformat
+    if value is None:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        raise HTTPException(status_code=422, detail=f"{name} must be an ISO 8601 timestamp")
+    if parsed.tzinfo is None:
+        raise HTTPException(status_code=422, detail=f"{name} needs a timezone, e.g. 2026-01-01T00:00:00Z")
+    return parsed.astimezone(timezone.utc).isoformat()
+
+@router.get("/jobs",response_model=JobListResponse)
+def list_research_jobs(
+    status:Optional[str]=None,
+    depth:Optional[str]=None,
+    created_after:Optional[str]=None,
+    created_before:Optional[str]=None,
+    limit:int=20,
+    cursor:Optional[str]=None,
+):
+    """Job summaries, newest first. Filter by status, depth and creation time; follow next_cursor for more."""
+    if status is not None and status not in ("pending", "running", "complete", "failed"):
+        raise HTTPException(status_code=422, detail="status must be 'pending', 'running', 'complete', or 'failed'")
+    if depth is not None and depth not in ("quick", "standard", "deep"):
+        raise HTTPException(status_code=422, detail="depth must be 'quick', 'standard', or 'deep'")
+    if not 1 <= limit <= _LIST_MAX_LIMIT:
+        raise HTTPException(status_code=422, detail=f"limit must be between 1 and {_LIST_MAX_LIMIT}")
+    jobs = list_jobs(
+        status=status,
+        depth=depth,
+        created_after=_iso("created_after", created_after),
+        created_before=_iso("created_before", created_before),
+        limit=limit + 1,  # one extra row tells us whether there is a next page
+        after=_decode_cursor(cursor) if cursor else None,
+    )
+    page = jobs[:limit]
+    return JobListResponse(
+        jobs=[JobSummaryResponse(**job) for job in page],
+        next_cursor=_encode_cursor(page[-1]) if len(jobs) > limit else None,
+    )
+
 @router.get("/jobs/{job_id}/status",response_model=JobStatusResponse)
 def get_job_status(job_id:str):
-    job = get_job(job_id)
+    job = get_job_summary(job_id)
     if not job:
         raise HTTPException(status_code=404,detail=f"Job {job_id} not found")
     return JobStatusResponse(
@@ -79,24 +525,78 @@ def get_job_status(job_id:str):
         created_at=job["created_at"],
         updated_at=job["updated_at"],
     )
-@router.get("/jobs/{job_id}/result",response_model=JobResultResponse)
-def get_job_result(job_id:str):
-    job = get_job(job_id)
+@router.get("/jobs/{job_id}/events")
+async def stream_job_events(job_id:str, request:Request):
+    """Server-sent events: one `node` event per agent transition, then `complete` or `failed`."""
+    job = await asyncio.to_thread(get_job_summary, job_id)
     if not job:
         raise HTTPException(status_code=404,detail=f"Job {job_id} not found")
-    
+
+    def _sse(event:dict)->str:
+        return f"event: {event['event']}\ndata: {json.dumps(event)}\n\n"
+
+    async def _events():
+        history, q = event_bus.subscribe(job_id)
+        try:
+            for event in history:
+                yield _sse(event)
+                if event["event"] in TERMINAL_EVENTS:
+                    return
+            current = job
+            status = job["status"]
+            while status not in ("complete", "failed"):
+                remote = current.get("owner") not in (None, WORKER_ID)
+                try:
+                    event = await asyncio.wait_for(q.get(), timeout=_SSE_REMOTE_POLL_SECONDS if remote else _SSE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        return
+                    yield ": keep-alive\n\n"
+                    # the job may be running (or have finished) somewhere we don't see events from —
+                    # another worker, or a process before a restart
+                    current = await asyncio.to_thread(get_job_summary, job_id)
+                    if current["status"] != status and current["status"] not in ("complete", "failed"):
+                        yield _sse({"event": "status", "status": current["status"]})
+                    status = current["status"]
+                    continue
+                yield _sse(event)
+                if event["event"] in TERMINAL_EVENTS:
+                    return
+            yield _sse({"event": status, "status": status})
+        finally:
+            event_bus.unsubscribe(job_id, q)
+
+    return StreamingResponse(
+        _events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+def _job_result(job:dict)->JobResultResponse:
     result_data= {}
     if job["result"]:
         result_data = json.loads(job["result"])
+    # while the writer streams, the report so far stands in for the final one
+    partial = job["status"] not in ("complete", "failed") and bool(job.get("partial_report"))
     
     return JobResultResponse(
         job_id=job["job_id"],
         query=job["query"],
         status=job["status"],
-        report=result_data.get("report"),
+        report=job["partial_report"] if partial else result_data.get("report"),
+        partial=partial,
         sources=result_data.get("sources"),
+        routing=result_data.get("routing"),
+        dedup=result_data.get("dedup"),
         agent_turns=job["agent_turns"],
         error=job["error"],
         created_at=job["created_at"],
         updated_at=job["updated_at"],
-    )
\ No newline at end of file
+    )
+
+@router.get("/jobs/{job_id}/result",response_model=JobResultResponse)
+def get_job_result(job_id:str):
+    job = get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404,detail=f"Job {job_id} not found")
+    return _job_result(job)
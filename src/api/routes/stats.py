@@ -0,0 +1,23 @@
+from fastapi import APIRouter
+from src.tools.cache import tool_cache_stats
+from src.agents.llm_cache import llm_cache_stats
+from src.clients import pool_stats
+from src.api.scheduler import scheduler
+from src.persistence import retention
+from src.api.routes.research import resumed_jobs
+from src.persistence.db import WORKER_ID
+
+router = APIRouter()
+
+## Runtime stats endpoint__ cache effectiveness and other in-process counters (per worker process).
+@router.get("/stats")
+def get_stats():
+    return {
+        "worker": WORKER_ID,  # which uvicorn worker answered — every number below is its own
+        "scheduler": scheduler.stats(),
+        "tool_cache": tool_cache_stats(),
+        "llm_cache": llm_cache_stats(),
+        "http_pools": pool_stats(),
+        "checkpoint_compaction": retention.last_report,  # last background run (per process)
+        "resumed_jobs": resumed_jobs,  # interrupted jobs picked up at startup or adopted from dead workers
+    }
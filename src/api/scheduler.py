@@ -0,0 +1,210 @@
+import asyncio
+import itertools
+import math
+import os
+import queue
+import threading
+import time
+from collections import deque
+from typing import Callable
+
+# Quick jobs jump ahead of deep ones — they finish fast and free a worker sooner.
+DEPTH_PRIORITY = {"quick": 0, "standard": 1, "deep": 2}
+# Async graph mode: jobs run as tasks on the app's event loop instead of OS threads.
+ASYNC_GRAPH = os.getenv("ARGUS_ASYNC_GRAPH", "false").lower() in ("1", "true", "yes")
+
+
+class QueueFullError(Exception):
+    """Raised by JobScheduler.submit when the queue already holds max_queue jobs."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"job queue full, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class _SchedulerStats:
+    """Counters and wait/run-time windows shared by both scheduler flavours."""
+
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._seq = itertools.count()  # FIFO within a priority, and never compares the callables
+        self._lock = threading.Lock()
+        self._running = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._waits: deque[float] = deque(maxlen=200)
+        self._durations: deque[float] = deque(maxlen=200)
+
+    def _queue_depth(self) -> int:
+        raise NotImplementedError
+
+    def _check_room(self, bounded: bool) -> None:
+        # the queues themselves are unbounded so batch feeds (bounded=False) can always enqueue;
+        # submits happen on the event loop thread, so check-then-put doesn't race
+        if bounded and self._queue_depth() >= self.max_queue:
+            raise self._rejected_error()
+
+    def free_slots(self) -> int:
+        return max(0, self.max_queue - self._queue_depth())
+
+    def _rejected_error(self) -> QueueFullError:
+        with self._lock:
+            self._rejected += 1
+        return QueueFullError(self.retry_after())
+
+    def _job_started(self, enqueued: float) -> float:
+        started = time.monotonic()
+        with self._lock:
+            self._running += 1
+            self._waits.append(started - enqueued)
+        return started
+
+    def _job_finished(self, started: float, ok: bool) -> None:
+        with self._lock:
+            self._running -= 1
+            self._durations.append(time.monotonic() - started)
+            if ok:
+                self._completed += 1
+            else:
+                self._failed += 1
+
+    def retry_after(self) -> int:
+        """Rough seconds until a queue slot frees up — some worker finishes every avg/workers seconds."""
+        with self._lock:
+            avg = sum(self._durations) / len(self._durations) if self._durations else 30.0
+        return max(1, math.ceil(avg / self.workers))
+
+    def stats(self) -> dict:
+        with self._lock:
+            waits = sorted(self._waits)
+            return {
+                "mode": "async" if isinstance(self, AsyncJobScheduler) else "threads",
+                "workers": self.workers,
+                "queue_depth": self._queue_depth(),
+                "max_queue": self.max_queue,
+                "running": self._running,
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "avg_wait_seconds": round(sum(waits) / len(waits), 3) if waits else 0.0,
+                "p95_wait_seconds": round(waits[max(0, math.ceil(len(waits) * 0.95) - 1)], 3) if waits else 0.0,
+                "max_wait_seconds": round(waits[-1], 3) if waits else 0.0,
+            }
+
+
+class JobScheduler(_SchedulerStats):
+    """Dedicated worker threads for graph runs, fed from a bounded priority queue.
+    Keeps research jobs off the Starlette threadpool that serves /jobs/* requests.
+    """
+
+    def __init__(self, workers: int, max_queue: int):
+        super().__init__(workers, max_queue)
+        self._queue: queue.PriorityQueue = queue.PriorityQueue()
+        self._threads: list[threading.Thread] = []
+
+    def _queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def start(self) -> None:
+        with self._lock:
+            if self._threads:
+                return
+            self._threads = [
+                threading.Thread(target=self._worker, name=f"argus-job-{i}", daemon=True)
+                for i in range(self.workers)
+            ]
+        for thread in self._threads:
+            thread.start()
+
+    def shutdown(self) -> None:
+        """Lets running jobs finish; jobs still queued stay 'pending' in the DB."""
+        # -inf sorts the stop sentinels ahead of every queued job, so each worker exits after its current one
+        for _ in self._threads:
+            self._queue.put((-math.inf, next(self._seq), None))
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    async def stop(self) -> None:
+        # joining worker threads from the lifespan hook must not block the event loop
+        await asyncio.to_thread(self.shutdown)
+
+    def submit(self, fn: Callable, *args, priority: int = 1, bounded: bool = True) -> None:
+        """bounded=False skips the max_queue check — only for callers that cap their own backlog."""
+        self._check_room(bounded)
+        self._queue.put_nowait((priority, next(self._seq), (fn, args, time.monotonic())))
+
+    def _worker(self) -> None:
+        while True:
+            _, _, item = self._queue.get()
+            if item is None:
+                return
+            fn, args, enqueued = item
+            started = self._job_started(enqueued)
+            ok = True
+            try:
+                fn(*args)
+            except Exception:
+                ok = False  # jobs record their own failures; this only keeps the worker alive
+            self._job_finished(started, ok)
+
+
+class AsyncJobScheduler(_SchedulerStats):
+    """JobScheduler's contract for the async graph: `workers` concurrent jobs as tasks on the
+    app's event loop. Jobs are coroutine functions; waiting on I/O costs no thread.
+    """
+
+    def __init__(self, workers: int, max_queue: int):
+        super().__init__(workers, max_queue)
+        self._queue: asyncio.PriorityQueue | None = None
+        self._tasks: list[asyncio.Task] = []
+
+    def _queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def start(self) -> None:
+        """Call from inside the running loop (lifespan hook)."""
+        if self._tasks:
+            return
+        self._queue = asyncio.PriorityQueue()
+        self._tasks = [asyncio.create_task(self._worker(), name=f"argus-job-{i}") for i in range(self.workers)]
+
+    async def stop(self) -> None:
+        """Lets running jobs finish; jobs still queued stay 'pending' in the DB."""
+        for _ in self._tasks:
+            await self._queue.put((-math.inf, next(self._seq), None))  # ahead of queued jobs, see JobScheduler.shutdown
+        await asyncio.gather(*self._tasks)
+        self._tasks = []
+
+    def submit(self, fn: Callable, *args, priority: int = 1, bounded: bool = True) -> None:
+        self._check_room(bounded)
+        self._queue.put_nowait((priority, next(self._seq), (fn, args, time.monotonic())))
+
+    async def _worker(self) -> None:
+        while True:
+            _, _, item = await self._queue.get()
+            if item is None:
+                return
+            fn, args, enqueued = item
+            started = self._job_started(enqueued)
+            ok = True
+            try:
+                await fn(*args)
+            except Exception:
+                ok = False
+            self._job_finished(started, ok)
+
+
+# Single shared instance — started/stopped by the lifespan hook in main.py.
+if ASYNC_GRAPH:
+    scheduler = AsyncJobScheduler(
+        workers=int(os.getenv("ARGUS_ASYNC_MAX_JOBS", "100")),
+        max_queue=int(os.getenv("ARGUS_JOB_QUEUE_SIZE", "20")),
+    )
+else:
+    scheduler = JobScheduler(
+        workers=int(os.getenv("ARGUS_JOB_WORKERS", "4")),
+        max_queue=int(os.getenv("ARGUS_JOB_QUEUE_SIZE", "20")),
+    )
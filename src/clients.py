@@ -0,0 +1,161 @@
+import os
+import threading
+import arxiv
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from langchain_groq import ChatGroq
+from tavily import TavilyClient, AsyncTavilyClient
+from src.tools.rate_limit import TokenBucket, current_deadline
+
+# Process-wide client registry. Every node and tool used to build its own ChatGroq /
+# TavilyClient / arxiv.Client per call — a fresh TLS handshake on every agent hop.
+# Clients here are created once, shared across threads, and sit on keep-alive pools
+# sized for the number of jobs that run at the same time.
+
+LLM_MODEL = "llama-3.3-70b-versatile"
+
+_ASYNC_GRAPH = os.getenv("ARGUS_ASYNC_GRAPH", "false").lower() in ("1", "true", "yes")
+_CONCURRENT_JOBS = int(os.getenv("ARGUS_ASYNC_MAX_JOBS", "100") if _ASYNC_GRAPH else os.getenv("ARGUS_JOB_WORKERS", "4"))
+# fan-out + concurrent tools: a single job can have several requests in flight per provider
+_POOL_SIZE = int(os.getenv("ARGUS_HTTP_POOL_SIZE", str(_CONCURRENT_JOBS * 4)))
+
+_lock = threading.Lock()
+_llms: dict[tuple[str, float], ChatGroq] = {}
+_sessions: dict[str, requests.Session] = {}
+_clients: dict[str, object] = {}
+_async_http: dict[str, httpx.AsyncClient] = {}
+_stats: dict[str, dict[str, int]] = {}
+
+# ArXiv asks for at most one request every 3 seconds — per process, not per result or per job
+ARXIV_LIMITER = TokenBucket(rate=1 / float(os.getenv("ARGUS_ARXIV_MIN_INTERVAL", "3")))
+
+_LIMITS = httpx.Limits(max_connections=_POOL_SIZE, max_keepalive_connections=_POOL_SIZE)
+_groq_http = httpx.Client(limits=_LIMITS, timeout=httpx.Timeout(60.0, connect=10.0))
+# async mode (ARGUS_ASYNC_GRAPH): connections belong to the app's single event loop
+_groq_async_http = httpx.AsyncClient(limits=_LIMITS, timeout=httpx.Timeout(60.0, connect=10.0))
+
+
+class _RateLimitedSession(requests.Session):
+    """Takes a token before every HTTP request, retries included — or raises RateLimitTimeout
+    when the token would come after the running tool call's deadline."""
+
+    def __init__(self, limiter: TokenBucket):
+        super().__init__()
+        self.limiter = limiter
+
+    def request(self, *args, **kwargs):
+        self.limiter.acquire(deadline=current_deadline())
+        return super().request(*args, **kwargs)
+
+
+def _count(name: str, created: bool) -> None:
+    counters = _stats.setdefault(name, {"created": 0, "reused": 0})
+    counters["created" if created else "reused"] += 1
+
+def _session(name: str, limiter: TokenBucket | None = None) -> requests.Session:
+    """Keep-alive requests.Session per provider, pool sized to _POOL_SIZE. Call with _lock held."""
+    if name not in _sessions:
+        session = _RateLimitedSession(limiter) if limiter else requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=_POOL_SIZE)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        _sessions[name] = session
+    return _sessions[name]
+
+def get_llm(temperature: float, model: str = LLM_MODEL) -> ChatGroq:
+    """One ChatGroq per (model, temperature), all sharing one httpx connection pool."""
+    key = (model, temperature)
+    with _lock:
+        llm = _llms.get(key)
+        _count("groq", created=llm is None)
+        if llm is None:
+            llm = ChatGroq(
+                model=model,
+                api_key=os.getenv("GROQ_API_KEY"),
+                temperature=temperature,
+                http_client=_groq_http,
+                http_async_client=_groq_async_http,
+            )
+            _llms[key] = llm
+    return llm
+
+def get_tavily() -> TavilyClient:
+    with _lock:
+        client = _clients.get("tavily")
+        _count("tavily", created=client is None)
+        if client is None:
+            client = TavilyClient(api_key=os.getenv("TAVILY_API_KEY"), session=_session("tavily"))
+            _clients["tavily"] = client
+    return client
+
+def get_arxiv() -> arxiv.Client:
+    with _lock:
+        client = _clients.get("arxiv")
+        _count("arxiv", created=client is None)
+        if client is None:
+            # delay_seconds=0: the client's own limiter is per instance and not thread-safe;
+            # ARXIV_LIMITER on the session enforces the request-level limit for the whole process
+            client = arxiv.Client(delay_seconds=0)
+            client._session = _session("arxiv", limiter=ARXIV_LIMITER)  # arxiv.Client has no session argument
+            _clients["arxiv"] = client
+    return client
+
+def get_http_session(name: str) -> requests.Session:
+    """Shared keep-alive session for providers without a client object (Wikipedia)."""
+    with _lock:
+        _count(name, created=name not in _sessions)
+        return _session(name)
+
+def _async_client(name: str) -> httpx.AsyncClient:
+    """Keep-alive httpx.AsyncClient per provider. Call with _lock held."""
+    if name not in _async_http:
+        _async_http[name] = httpx.AsyncClient(limits=_LIMITS, timeout=httpx.Timeout(30.0, connect=10.0))
+    return _async_http[name]
+
+def get_async_tavily() -> AsyncTavilyClient:
+    with _lock:
+        client = _clients.get("tavily_async")
+        _count("tavily_async", created=client is None)
+        if client is None:
+            # own AsyncClient: AsyncTavilyClient sets its auth headers and base_url on it
+            client = AsyncTavilyClient(api_key=os.getenv("TAVILY_API_KEY"), client=_async_client("tavily_async"))
+            _clients["tavily_async"] = client
+    return client
+
+def get_async_http(name: str) -> httpx.AsyncClient:
+    """Shared keep-alive AsyncClient for providers without an async client object (Wikipedia)."""
+    with _lock:
+        _count(f"{name}_async", created=name not in _async_http)
+        return _async_client(name)
+
+def _open_connections(client: httpx.Client | httpx.AsyncClient) -> int:
+    pool = getattr(client._transport, "_pool", None)
+    return len(pool.connections) if pool is not None else 0
+
+def _requests_pool_stats(session: requests.Session) -> dict:
+    requests_sent = connections = 0
+    for adapter in session.adapters.values():
+        pools = adapter.poolmanager.pools
+        for pool in (pools[key] for key in pools.keys()):
+            requests_sent += pool.num_requests
+            connections += pool.num_connections
+    return {
+        "requests": requests_sent,
+        "connections_opened": connections,
+        "connection_reuse_rate": round(1 - connections / requests_sent, 3) if requests_sent else 0.0,
+    }
+
+def pool_stats() -> dict:
+    """Client construction vs reuse per provider, plus HTTP connection reuse for each pool."""
+    with _lock:
+        stats = {name: dict(counters) for name, counters in _stats.items()}
+        sessions = dict(_sessions)
+        async_clients = dict(_async_http)
+    for name, session in sessions.items():
+        stats.setdefault(name, {}).update(_requests_pool_stats(session))
+    stats.setdefault("groq", {})["open_connections"] = _open_connections(_groq_http) + _open_connections(_groq_async_http)
+    for name, client in async_clients.items():
+        stats.setdefault(name if name.endswith("_async") else f"{name}_async", {})["open_connections"] = _open_connections(client)
+    stats.setdefault("arxiv", {})["rate_limit"] = ARXIV_LIMITER.stats()
+    return {"pool_size": _POOL_SIZE, "clients": stats}
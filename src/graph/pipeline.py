@@ -1,31 +1,76 @@
+import os
 from langgraph.graph import StateGraph,START
 from src.graph.state import ReasearchState
-from src.agents.supervisor import supervisor_node
-from src.agents.planner import planner_node 
-from src.agents.researcher import research_node
-from src.agents.critic import critic_node
-from src.agents.writer import writer_node
+from src.agents.supervisor import supervisor_node, asupervisor_node
+from src.agents.planner import planner_node, aplanner_node, speculative_planner_node, aspeculative_planner_node
+from src.agents.researcher import research_node, aresearch_node, research_fan_out_node, research_branch_node, aresearch_branch_node
+from src.agents.critic import critic_node, acritic_node
+from src.agents.writer import writer_node, awriter_node
 from src.persistence.checkpointer import get_checkpointer
+from src.metrics import instrument_node
 
-def build_graph():
+_SYNC_NODES = {
+    "supervisor": supervisor_node,
+    "planner": planner_node,
+    "researcher": research_node,
+    "research_branch": research_branch_node,
+    "critic": critic_node,
+    "writer": writer_node,
+}
+# async variants: same prompts/parsing, but LLM and tool I/O await instead of holding a thread
+_ASYNC_NODES = {
+    "supervisor": asupervisor_node,
+    "planner": aplanner_node,
+    "researcher": aresearch_node,
+    "research_branch": aresearch_branch_node,
+    "critic": acritic_node,
+    "writer": awriter_node,
+}
+
+def build_graph(fan_out: bool | None = None, async_nodes: bool = False, checkpointer=None, speculative: bool | None = None):
+    """fan_out=True researches every sub-question (and later every gap) in parallel branches
+    instead of one question per supervisor round trip. Defaults to the ARGUS_FAN_OUT env var.
+    async_nodes=True registers the async node variants — drive that graph with ainvoke/astream
+    and pass an AsyncSqliteSaver (get_async_checkpointer) as checkpointer.
+    speculative=True starts web/Wikipedia search on the raw query while the planner runs; the
+    first research turn merges the results. Defaults to the ARGUS_SPECULATIVE_SEARCH env var.
+    """
+    if fan_out is None:
+        fan_out = os.getenv("ARGUS_FAN_OUT", "false").lower() in ("1", "true", "yes")
+    if speculative is None:
+        speculative = os.getenv("ARGUS_SPECULATIVE_SEARCH", "false").lower() in ("1", "true", "yes")
+    # every node is timed into argus_node_duration_seconds (GET /metrics)
+    nodes = {name: instrument_node(name, fn) for name, fn in (_ASYNC_NODES if async_nodes else _SYNC_NODES).items()}
+    if speculative:
+        nodes["planner"] = instrument_node("planner", aspeculative_planner_node if async_nodes else speculative_planner_node)
     builder = StateGraph(ReasearchState)
     
     #all nodes 
-    builder.add_node("supervisor", supervisor_node)
-    builder.add_node("planner", planner_node)
-    builder.add_node("researcher", research_node)
-    builder.add_node("critic", critic_node)
-    builder.add_node("writer", writer_node)
+    builder.add_node("supervisor", nodes["supervisor"])
+    builder.add_node("planner", nodes["planner"])
+    if fan_out:
+        # "researcher" becomes a dispatcher that Send()s one research_branch per question
+        builder.add_node("researcher", instrument_node("researcher", research_fan_out_node), destinations=("research_branch",))
+        builder.add_node("research_branch", nodes["research_branch"])
+    else:
+        builder.add_node("researcher", nodes["researcher"])
+    builder.add_node("critic", nodes["critic"])
+    builder.add_node("writer", nodes["writer"])
     
     #all edges return to supervisor after finishing
     #supervisoer_node returns command(goto=...) which handles dynamic routing
     builder.add_edge(START, "supervisor")
     builder.add_edge("planner", "supervisor")
-    builder.add_edge("researcher", "supervisor")
+    if fan_out:
+        # supervisor runs once, after every branch of the superstep has merged
+        builder.add_edge("research_branch", "supervisor")
+    else:
+        builder.add_edge("researcher", "supervisor")
     builder.add_edge("critic", "supervisor")
     builder.add_edge("writer", "supervisor")
     
-    checkpointer = get_checkpointer()
+    if checkpointer is None:
+        checkpointer = get_checkpointer()
     return builder.compile(checkpointer=checkpointer) ## checkpointer add karna hai
 
 # ── Smoke test ───────────────────────────────────────────────────────────────
@@ -46,9 +91,12 @@ if __name__ == "__main__":
             "research_findings": [],
             "gaps_identified": [],
             "research_iterations": 0,
+            "reviewed_iterations": 0,
             "final_report": "",
             "sources": [],
             "next_agent": "",
+            "routing_log": [],
+            "dedup_log": [],
         },
         config={"configurable": {"thread_id": job_id}},
     )
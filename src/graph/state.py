@@ -1,3 +1,4 @@
+import operator
 from typing import Annotated,TypedDict 
 from langgraph.graph.message import add_messages
 
@@ -6,17 +7,21 @@ class ReasearchState(TypedDict):
     #------------Input ------ 
     query: str
     depth: str 
+    bypass_llm_cache: bool #skip completion-cache lookups for this job
     
     # ------Agent working memory ----- 
     messages: Annotated[list,add_messages] # reducer:appends,never overwrites 
     sub_questions: list[str] #planner fills this 
-    research_findings: list[str] #reasearcher accumulates this
+    research_findings: Annotated[list[str],operator.add] #reasearcher appends new findings only (parallel branches merge here); long bodies are "finding:<digest>" refs into research.db, resolve with load_findings
     gaps_identified: list[str] #critics fill this
     research_iterations: int #superviser incremets this
+    reviewed_iterations: int #critic sets this to the research_iterations it reviewed
     
     #output 
     final_report: str 
-    sources: list[str]
+    sources: Annotated[list[str],operator.add] #appended by every research branch, deduped by the writer
+    dedup_log: Annotated[list[dict],operator.add] #critic/writer record what dedup merged and what the token budget packed/condensed; critic entries also carry its coverage scores and who decided
     
     #routing 
-    next_agent: str #superviser sets this each turn 
\ No newline at end of file
+    next_agent: str #superviser sets this each turn 
+    routing_log: Annotated[list[dict],operator.add] #one {next_agent, path} entry per supervisor decision
@@ -0,0 +1,196 @@
+import asyncio
+import bisect
+import functools
+import threading
+import time
+from typing import Callable
+
+# Process-local Prometheus metrics, rendered in the text exposition format by GET /metrics.
+# Hand-rolled instead of prometheus_client: a handful of counters/histograms is all we need,
+# and an observation is one perf_counter pair, a lock and a bisect — negligible next to an LLM call.
+
+_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60)
+_JOB_BUCKETS = (5, 10, 20, 30, 45, 60, 90, 120, 180, 300, 600)
+_TOKEN_BUCKETS = (64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384)
+
+
+def _labels(labels: dict) -> tuple:
+    return tuple(sorted(labels.items()))
+
+def _fmt_labels(labels: tuple, extra: tuple = ()) -> str:
+    pairs = labels + extra
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self._lock = threading.Lock()
+        self._values: dict = {}
+        _REGISTRY.append(self)
+
+    def _samples(self) -> list[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        with self._lock:
+            samples = self._samples()
+        return "\n".join([f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}", *samples])
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = _labels(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def _samples(self) -> list[str]:
+        return [f"{self.name}{_fmt_labels(key)} {value}" for key, value in self._values.items()]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._values[_labels(labels)] = value
+
+    def _samples(self) -> list[str]:
+        return [f"{self.name}{_fmt_labels(key)} {value}" for key, value in self._values.items()]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, buckets: tuple = _LATENCY_BUCKETS):
+        super().__init__(name, help)
+        self.buckets = buckets
+
+    def observe(self, value: float, **labels) -> None:
+        key = _labels(labels)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * len(self.buckets), 0, 0.0]  # per-bucket, count, sum
+            i = bisect.bisect_left(self.buckets, value)
+            if i < len(self.buckets):
+                entry[0][i] += 1
+            entry[1] += 1
+            entry[2] += value
+
+    def _samples(self) -> list[str]:
+        lines = []
+        for key, (counts, count, total) in self._values.items():
+            cumulative = 0
+            for bound, n in zip(self.buckets, counts):
+                cumulative += n
+                lines.append(f"{self.name}_bucket{_fmt_labels(key, (('le', bound),))} {cumulative}")
+            lines.append(f"{self.name}_bucket{_fmt_labels(key, (('le', '+Inf'),))} {count}")
+            lines.append(f"{self.name}_count{_fmt_labels(key)} {count}")
+            lines.append(f"{self.name}_sum{_fmt_labels(key)} {round(total, 6)}")
+        return lines
+
+
+_REGISTRY: list[_Metric] = []
+
+NODE_LATENCY = Histogram("argus_node_duration_seconds", "Graph node execution time")
+TOOL_LATENCY = Histogram("argus_tool_duration_seconds", "Search tool call time, cache hits included")
+TOOL_CALLS = Counter("argus_tool_calls_total", "Search tool calls by outcome (ok|error)")
+TOOL_TIMEOUTS = Counter("argus_tool_timeouts_total", "Tool calls the researcher stopped waiting for")
+LLM_TOKENS = Histogram("argus_llm_tokens", "Tokens per LLM call by node and kind (prompt|completion)", _TOKEN_BUCKETS)
+JOB_DURATION = Histogram("argus_job_duration_seconds", "Job time from submission to complete/failed", _JOB_BUCKETS)
+QUEUE_DEPTH = Gauge("argus_job_queue_depth", "Jobs waiting for a scheduler worker")
+JOBS_RUNNING = Gauge("argus_jobs_running", "Jobs currently running")
+CRITIC_DECISIONS = Counter(
+    "argus_critic_decisions_total", "Critic reviews by who decided (coverage|llm) and outcome (gaps|no_gaps)"
+)
+SPECULATIVE_CALLS = Counter(
+    "argus_speculative_searches_total", "Speculative raw-query tool calls by outcome (used|empty|timed_out|unused|cancelled)"
+)
+SPECULATIVE_FINDINGS = Counter(
+    "argus_speculative_findings_total", "Findings from speculative searches: merged, or redundant with the researcher's own"
+)
+SPECULATIVE_HEAD_START = Histogram(
+    "argus_speculative_head_start_seconds", "Time speculative searches ran before the researcher claimed them"
+)
+
+
+def render() -> str:
+    return "\n".join(metric.render() for metric in _REGISTRY) + "\n"
+
+
+def instrument_node(name: str, fn: Callable) -> Callable:
+    """Wraps a graph node so every run lands in argus_node_duration_seconds{node=name}."""
+    if asyncio.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def _anode(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                NODE_LATENCY.observe(time.perf_counter() - start, node=name)
+        return _anode
+
+    @functools.wraps(fn)
+    def _node(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            NODE_LATENCY.observe(time.perf_counter() - start, node=name)
+    return _node
+
+
+def _is_error(result) -> bool:
+    # tools don't raise — they return {"error": ...} or a single [{"title": "Error", ...}]
+    if isinstance(result, dict):
+        return "error" in result
+    return bool(result) and isinstance(result, list) and result[0].get("title") == "Error"
+
+def _record_tool(name: str, start: float, result, failed: bool) -> None:
+    TOOL_LATENCY.observe(time.perf_counter() - start, tool=name)
+    TOOL_CALLS.inc(tool=name, outcome="error" if failed or _is_error(result) else "ok")
+
+def instrument_tool(name: str) -> Callable:
+    """Decorator for the search functions in src/tools/ — latency and ok/error counts per tool."""
+    def _decorate(fn: Callable) -> Callable:
+        if asyncio.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def _atool(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    result = await fn(*args, **kwargs)
+                except Exception:
+                    _record_tool(name, start, None, failed=True)
+                    raise
+                _record_tool(name, start, result, failed=False)
+                return result
+            return _atool
+
+        @functools.wraps(fn)
+        def _tool(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                result = fn(*args, **kwargs)
+            except Exception:
+                _record_tool(name, start, None, failed=True)
+                raise
+            _record_tool(name, start, result, failed=False)
+            return result
+        return _tool
+    return _decorate
+
+
+def record_llm_usage(node: str, response) -> None:
+    """Prompt/completion token counts from a fresh (non-cached) completion, when the provider sent them."""
+    usage = getattr(response, "usage_metadata", None) or {}
+    if usage:
+        LLM_TOKENS.observe(usage.get("input_tokens", 0), node=node, kind="prompt")
+        LLM_TOKENS.observe(usage.get("output_tokens", 0), node=node, kind="completion")
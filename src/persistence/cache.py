@@ -0,0 +1,82 @@
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+_CREATE_CACHE_TABLE = """
+CREATE TABLE IF NOT EXISTS cache(
+    key TEXT PRIMARY KEY,
+    namespace TEXT NOT NULL,
+    value TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+"""
+_CREATE_LRU_INDEX = "CREATE INDEX IF NOT EXISTS idx_cache_last_access ON cache(last_access);"
+
+
+class SqliteCache:
+    """Size-bounded key/value cache in its own SQLite file.
+    Values are JSON. Each entry carries its own TTL; once the table holds more than
+    max_entries rows the least recently read ones are evicted. Hit/miss counters are per
+    namespace and per process.
+    """
+
+    def __init__(self, path: Path, max_entries: int):
+        self.max_entries = max_entries
+        # one connection shared across threads, serialized by the lock — entries are small
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, timeout=10)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")  # a lost cache write on power loss is harmless; no fsync per commit
+        self._conn.execute(_CREATE_CACHE_TABLE)
+        self._conn.execute(_CREATE_LRU_INDEX)
+        self._conn.commit()
+        self._lock = threading.Lock()
+        self._stats: dict[str, dict[str, int]] = {}
+
+    def _count(self, namespace: str, field: str, n: int = 1) -> None:
+        counters = self._stats.setdefault(namespace, {"hits": 0, "misses": 0, "writes": 0, "evictions": 0})
+        counters[field] += n
+
+    def get(self, namespace: str, key: str) -> Any | None:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache WHERE key=?", (key,)
+            ).fetchone()
+            if row is None or row[1] < now:
+                self._count(namespace, "misses")
+                return None
+            self._conn.execute("UPDATE cache SET last_access=? WHERE key=?", (now, key))
+            self._conn.commit()
+            self._count(namespace, "hits")
+        return json.loads(row[0])
+
+    def set(self, namespace: str, key: str, value: Any, ttl: float) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, namespace, value, expires_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, namespace, json.dumps(value), now + ttl, now),
+            )
+            self._count(namespace, "writes")
+            overflow = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0] - self.max_entries
+            if overflow > 0:
+                # expired rows go first, then least recently read
+                evicted = self._conn.execute(
+                    "DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY expires_at < ? DESC, last_access LIMIT ?)",
+                    (now, overflow),
+                ).rowcount
+                self._count(namespace, "evictions", evicted)  # rows, not DELETE statements
+            self._conn.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+            namespaces = {name: dict(counters) for name, counters in self._stats.items()}
+        for counters in namespaces.values():
+            lookups = counters["hits"] + counters["misses"]
+            counters["hit_rate"] = round(counters["hits"] / lookups, 3) if lookups else 0.0
+        return {"entries": entries, "max_entries": self.max_entries, "namespaces": namespaces}
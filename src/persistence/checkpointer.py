@@ -1,10 +1,27 @@
 import sqlite3
+import aiosqlite
 from langgraph.checkpoint.sqlite import SqliteSaver
-from src.persistence.db import DB_PATH
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+from src.persistence.db import DB_PATH, SQLITE_TIMEOUT
+
+# Every uvicorn worker opens its own saver on the same file. WAL lets them read while one
+# writes; the busy timeout makes a checkpoint write wait its turn instead of failing with
+# "database is locked" when another worker (or compaction) holds the write lock.
+_PRAGMAS = ("PRAGMA journal_mode=WAL", "PRAGMA synchronous=NORMAL")
 
 
 def get_checkpointer() -> SqliteSaver:
     # Pass a raw connection directly — do NOT use from_conn_string() 
     # (it returns a context manager, not a saver instance)
-    conn = sqlite3.connect(str(DB_PATH), check_same_thread=False)
-    return SqliteSaver(conn)
\ No newline at end of file
+    conn = sqlite3.connect(str(DB_PATH), check_same_thread=False, timeout=SQLITE_TIMEOUT)
+    for pragma in _PRAGMAS:
+        conn.execute(pragma)
+    return SqliteSaver(conn)
+
+async def get_async_checkpointer() -> AsyncSqliteSaver:
+    # Same file and same tables as SqliteSaver, so both graphs can resume each other's threads.
+    # aiosqlite binds the connection to the running loop — call this from inside it (app lifespan).
+    conn = await aiosqlite.connect(str(DB_PATH), timeout=SQLITE_TIMEOUT)
+    for pragma in _PRAGMAS:
+        await conn.execute(pragma)
+    return AsyncSqliteSaver(conn)
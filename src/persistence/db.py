@@ -1,10 +1,29 @@
+import os
+import queue
 import sqlite3
+import hashlib
 import json 
-from datetime import datetime,timezone
+import socket
+import uuid
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from datetime import datetime,timedelta,timezone
 from pathlib import Path
 
-DB_PATH = Path(__file__).parent.parent.parent / "data" / "research.db"
-DB_PATH.parent.mkdir(exist_ok=True) # create data/  if it doesn't exist
+# ARGUS_DATA_DIR moves research.db and the cache DBs next to it (benchmarks point it at a temp dir)
+DB_PATH = Path(os.getenv("ARGUS_DATA_DIR", Path(__file__).parent.parent.parent / "data")) / "research.db"
+DB_PATH.parent.mkdir(parents=True, exist_ok=True) # create data/  if it doesn't exist
+# seconds any connection to research.db waits for another writer — with several uvicorn workers
+# the job table, checkpointer and compaction all compete for the same file lock
+SQLITE_TIMEOUT = float(os.getenv("ARGUS_SQLITE_TIMEOUT", "30"))
+
+# One id per process. Jobs record the worker that runs them; a worker whose heartbeat goes stale
+# (crashed, or shut down with jobs still queued) has its unfinished jobs adopted by the others.
+WORKER_ID = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+WORKER_HEARTBEAT_SECONDS = float(os.getenv("ARGUS_WORKER_HEARTBEAT_SECONDS", "10"))
+WORKER_STALE_SECONDS = 3 * WORKER_HEARTBEAT_SECONDS
 
 _CREATE_JOBS_TABLE = """
 CREATE TABLE IF NOT EXISTS jobs(
@@ -16,48 +35,427 @@ CREATE TABLE IF NOT EXISTS jobs(
     error TEXT,
     agent_turns INTEGER DEFAULT 0,
     created_at TEXT NOT NULL,
-    updated_at TEXT NOT NULL
+    updated_at TEXT NOT NULL,
+    query_key TEXT,
+    partial_report TEXT,
+    owner TEXT
+);
+"""
+# POST /research/batch: one row per query, in submission order. A batch can point at jobs it
+# didn't create (identical queries reuse a running or recent job), hence a table, not a column.
+_CREATE_BATCH_TABLE = """
+CREATE TABLE IF NOT EXISTS batch_jobs(
+    batch_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    job_id TEXT NOT NULL,
+    PRIMARY KEY (batch_id, position)
+);
+"""
+# query_key: normalized query, lets POST /research reuse a recent result for the same question
+# partial_report: the writer's report so far while it streams, cleared by the terminal write
+# owner: WORKER_ID of the process running the job
+# GET /jobs pages newest-first by (created_at, job_id), optionally within one status or depth
+_CREATE_JOBS_INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_jobs_reuse ON jobs(query_key, depth, status, updated_at);
+CREATE INDEX IF NOT EXISTS idx_jobs_created ON jobs(created_at, job_id);
+CREATE INDEX IF NOT EXISTS idx_jobs_status_created ON jobs(status, created_at, job_id);
+CREATE INDEX IF NOT EXISTS idx_jobs_depth_created ON jobs(depth, created_at, job_id);
+"""
+# everything but the report blobs — what status polls, listings and batch status read
+_SUMMARY_COLUMNS = "job_id, query, depth, status, error, agent_turns, created_at, updated_at, owner"
+_BUFFERED_COLUMNS = ("status", "result", "error", "agent_turns", "updated_at")
+
+# results at least this many bytes of JSON are stored zlib-compressed (as a BLOB in the same
+# column); reports compress 3-4x and older uncompressed rows are still read as-is
+_RESULT_COMPRESS_MIN = int(os.getenv("ARGUS_RESULT_COMPRESS_MIN", "1024"))
+
+# Content-addressed finding bodies. research_findings in graph state holds short refs to
+# these instead of the text, so each checkpoint carries ids rather than every body so far.
+_CREATE_FINDINGS_TABLE = """
+CREATE TABLE IF NOT EXISTS finding_bodies(
+    digest TEXT PRIMARY KEY,
+    body TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+"""
+FINDING_REF_PREFIX = "finding:"
+
+# Liveness of every API process sharing this database, and named leases for work only one of
+# them should do at a time (checkpoint compaction).
+_CREATE_WORKERS_TABLE = """
+CREATE TABLE IF NOT EXISTS workers(
+    worker_id TEXT PRIMARY KEY,
+    started_at TEXT NOT NULL,
+    heartbeat_at TEXT NOT NULL
+);
+"""
+_CREATE_LEASES_TABLE = """
+CREATE TABLE IF NOT EXISTS leases(
+    name TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    expires_at TEXT NOT NULL
 );
 """
+_FINDING_INLINE_MAX = int(os.getenv("ARGUS_FINDING_INLINE_MAX", "256"))  # shorter findings stay inline in state
 
-def _get_conn()-> sqlite3.Connection:
-    conn = sqlite3.connect(str(DB_PATH),check_same_thread=False,timeout=10)
-    #check_same_thread =false :background task thread!= request thread
-    #timeout=10 wait up to 10s for write lock instead of crashing immediately
+_POOL_SIZE = int(os.getenv("ARGUS_DB_POOL_SIZE", "8"))
+_FLUSH_INTERVAL = float(os.getenv("ARGUS_DB_FLUSH_INTERVAL", "0.5"))  # seconds between batched status writes
+_TERMINAL_STATUSES = ("complete", "failed")
+
+_pool: queue.Queue = queue.Queue(maxsize=_POOL_SIZE)
+_pool_created = 0
+_pool_lock = threading.Lock()
+_schema_ready = False
+
+# Non-terminal status updates ("running", ...) are buffered here and written in one
+# transaction every _FLUSH_INTERVAL; get_job overlays them so readers never see stale state.
+_pending: dict[str, tuple] = {}
+_pending_lock = threading.Lock()
+_flusher: threading.Thread | None = None
+
+def _new_conn()-> sqlite3.Connection:
+    conn = sqlite3.connect(str(DB_PATH),check_same_thread=False,timeout=SQLITE_TIMEOUT)
+    #check_same_thread =false :connections move between pool users on different threads
+    #timeout: wait for the write lock (other threads, other workers) instead of crashing immediately
     conn.row_factory = sqlite3.Row
-    conn.execute(_CREATE_JOBS_TABLE)
-    conn.commit()
+    # only takes effect on a brand-new file, and only before the WAL switch writes its header;
+    # older files are converted offline (retention.enable_incremental_vacuum), otherwise a no-op
+    conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+    conn.execute("PRAGMA journal_mode=WAL")     # readers never block the writer and vice versa
+    conn.execute("PRAGMA synchronous=NORMAL")   # safe under WAL, skips an fsync per commit
     return conn
 
-def create_job(job_id:str,query:str,depth:str)->None:
+def init_db()->None:
+    """Creates the jobs, finding_bodies, batch_jobs, workers and leases tables once per process. Called from the lifespan hook; the pool also
+    calls it lazily so scripts that skip the API (pipeline smoke test) still work."""
+    global _schema_ready
+    with _pool_lock:
+        if _schema_ready:
+            return
+        conn = _new_conn()
+        conn.execute(_CREATE_JOBS_TABLE)
+        # databases created before query_key/partial_report/owner existed get the columns added in place
+        columns = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+        for column in ("query_key", "partial_report", "owner"):
+            if column not in columns:
+                conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} TEXT")
+        conn.executescript(_CREATE_JOBS_INDEXES)
+        conn.execute(_CREATE_FINDINGS_TABLE)
+        conn.execute(_CREATE_BATCH_TABLE)
+        conn.execute(_CREATE_WORKERS_TABLE)
+        conn.execute(_CREATE_LEASES_TABLE)
+        conn.commit()
+        conn.close()
+        _schema_ready = True
+
+@contextmanager
+def _connection():
+    """Borrows a pooled connection; commits on success, rolls back on error."""
+    global _pool_created
+    init_db()
+    try:
+        conn = _pool.get_nowait()
+    except queue.Empty:
+        with _pool_lock:
+            create = _pool_created < _POOL_SIZE
+            if create:
+                _pool_created += 1
+        conn = _new_conn() if create else _pool.get()
+    try:
+        yield conn
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        _pool.put(conn)
+
+def create_job(job_id:str,query:str,depth:str,query_key:str |None = None)->None:
     now = datetime.now(timezone.utc).isoformat()
-    with _get_conn() as conn:
+    with _connection() as conn:
         conn.execute(
-            "INSERT INTO jobs (job_id, query, depth, status, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
-            (job_id, query, depth, "pending", now, now)
+            "INSERT INTO jobs (job_id, query, depth, status, created_at, updated_at, query_key, owner) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (job_id, query, depth, "pending", now, now, query_key, WORKER_ID)
         )
-        conn.commit()
-        
+
+def create_batch(batch_id:str,job_ids:list[str])->None:
+    with _connection() as conn:
+        conn.executemany(
+            "INSERT INTO batch_jobs (batch_id, position, job_id) VALUES (?, ?, ?)",
+            [(batch_id, i, job_id) for i, job_id in enumerate(job_ids)],
+        )
+
+def get_batch_jobs(batch_id:str,with_result:bool=False)->list[dict]:
+    """Every job of a batch in submission order (empty if the batch doesn't exist).
+    Summary columns only unless with_result=True."""
+    columns = "jobs.*" if with_result else ", ".join(f"jobs.{c}" for c in _SUMMARY_COLUMNS.split(", "))
+    with _connection() as conn:
+        rows = conn.execute(
+            f"SELECT {columns} FROM batch_jobs JOIN jobs ON jobs.job_id = batch_jobs.job_id "
+            "WHERE batch_jobs.batch_id=? ORDER BY batch_jobs.position",
+            (batch_id,),
+        ).fetchall()
+    return [_with_buffered(dict(row)) for row in rows]
+
+def list_jobs(
+    status:str | None = None,
+    depth:str | None = None,
+    created_after:str | None = None,
+    created_before:str | None = None,
+    limit:int = 20,
+    after:tuple[str,str] | None = None,
+)->list[dict]:
+    """Job summaries newest first. `after` is the (created_at, job_id) of the last job of the
+    previous page — keyset pagination, so deep pages cost the same as the first."""
+    flush_status_writes()  # status filters must see buffered "running" updates
+    where, params = [], []
+    if status:
+        where.append("status=?")
+        params.append(status)
+    if depth:
+        where.append("depth=?")
+        params.append(depth)
+    if created_after:
+        where.append("created_at>=?")
+        params.append(created_after)
+    if created_before:
+        where.append("created_at<?")
+        params.append(created_before)
+    if after:
+        where.append("(created_at, job_id) < (?, ?)")
+        params.extend(after)
+    sql = f"SELECT {_SUMMARY_COLUMNS} FROM jobs"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY created_at DESC, job_id DESC LIMIT ?"
+    with _connection() as conn:
+        rows = conn.execute(sql, (*params, limit)).fetchall()
+    return [dict(row) for row in rows]
+
+def heartbeat()->None:
+    """Registers this worker or refreshes its heartbeat."""
+    now = datetime.now(timezone.utc).isoformat()
+    with _connection() as conn:
+        conn.execute(
+            "INSERT INTO workers (worker_id, started_at, heartbeat_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(worker_id) DO UPDATE SET heartbeat_at=excluded.heartbeat_at",
+            (WORKER_ID, now, now),
+        )
+
+def unregister_worker()->None:
+    """At shutdown — whatever this worker leaves unfinished is adoptable right away."""
+    flush_status_writes()
+    with _connection() as conn:
+        conn.execute("DELETE FROM workers WHERE worker_id=?", (WORKER_ID,))
+        conn.execute("DELETE FROM leases WHERE owner=?", (WORKER_ID,))
+
+def _is_dead_local(worker_id:str)->bool:
+    # a worker on this host whose pid is gone crashed — no need to wait for its heartbeat to go stale
+    host, _, rest = worker_id.rpartition("-")[0].rpartition("-")
+    if os.name != "posix" or host != socket.gethostname() or not rest.isdigit():
+        return False
+    try:
+        os.kill(int(rest), 0)
+    except ProcessLookupError:
+        return True
+    except OSError:
+        pass  # exists, owned by someone else
+    return False
+
+def claim_orphaned_jobs(stale_seconds:float)->list[dict]:
+    """Takes over pending/running jobs whose worker is gone: no owner (older databases), an owner
+    no longer registered, one whose heartbeat is older than stale_seconds, or a dead pid on this
+    host. One UPDATE, so two workers starting together never both claim the same job."""
+    flush_status_writes()
+    cutoff = (datetime.now(timezone.utc) - timedelta(seconds=stale_seconds)).isoformat()
+    with _connection() as conn:
+        conn.execute("DELETE FROM workers WHERE heartbeat_at < ? AND worker_id != ?", (cutoff, WORKER_ID))
+        dead = [row["worker_id"] for row in conn.execute("SELECT worker_id FROM workers") if _is_dead_local(row["worker_id"])]
+        conn.executemany("DELETE FROM workers WHERE worker_id=?", [(w,) for w in dead])
+        rows = conn.execute(
+            "UPDATE jobs SET owner=? WHERE status IN ('pending', 'running') "
+            "AND (owner IS NULL OR (owner != ? AND owner NOT IN (SELECT worker_id FROM workers))) "
+            "RETURNING job_id, query, depth, status, created_at",
+            (WORKER_ID, WORKER_ID),
+        ).fetchall()
+    return sorted((dict(row) for row in rows), key=lambda job: job["created_at"])
+
+def owns_job(job_id:str)->bool:
+    """False once another worker has claimed the job — this one missed enough heartbeats (stalled
+    loop, locked database) to look dead, and the claimant is resuming the same checkpoint thread."""
+    with _connection() as conn:
+        row = conn.execute("SELECT owner FROM jobs WHERE job_id=?", (job_id,)).fetchone()
+    return row is not None and row["owner"] in (None, WORKER_ID)
+
+def acquire_lease(name:str,ttl_seconds:float)->bool:
+    """True if this worker holds `name` for the next ttl_seconds (taken over once the holder's lease expires)."""
+    now = datetime.now(timezone.utc)
+    with _connection() as conn:
+        conn.execute(
+            "INSERT INTO leases (name, owner, expires_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET owner=excluded.owner, expires_at=excluded.expires_at "
+            "WHERE leases.owner=excluded.owner OR leases.expires_at < ?",
+            (name, WORKER_ID, (now + timedelta(seconds=ttl_seconds)).isoformat(), now.isoformat()),
+        )
+        row = conn.execute("SELECT owner FROM leases WHERE name=?", (name,)).fetchone()
+    return row is not None and row["owner"] == WORKER_ID
+
+def find_recent_result(query_key:str,depth:str,max_age_seconds:float)->dict | None:
+    """Newest completed job for the same normalized query + depth finished within max_age_seconds."""
+    cutoff = (datetime.now(timezone.utc) - timedelta(seconds=max_age_seconds)).isoformat()
+    with _connection() as conn:
+        row = conn.execute(
+            "SELECT job_id, status, updated_at FROM jobs WHERE query_key=? AND depth=? AND status='complete' "
+            "AND updated_at >= ? ORDER BY updated_at DESC LIMIT 1",
+            (query_key, depth, cutoff),
+        ).fetchone()
+    return dict(row) if row else None
+
+def _flush_loop()->None:
+    while True:
+        time.sleep(_FLUSH_INTERVAL)
+        try:
+            flush_status_writes()
+        except sqlite3.Error as e:
+            print(f"[DB] batched status flush failed: {e}")
+
+def flush_status_writes()->None:
+    """Writes every buffered status update in a single transaction."""
+    with _pending_lock:
+        batch = list(_pending.values())
+        _pending.clear()
+    if batch:
+        with _connection() as conn:
+            # a batch copied just before a terminal write must not resurrect the job as "running"
+            conn.executemany(
+                "UPDATE jobs SET status=?, result=?, error=?, agent_turns=?, updated_at=? WHERE job_id=? AND status NOT IN ('complete', 'failed')",
+                batch,
+            )
+
 def update_job_status(
     job_id:str,
     status:str,
     result :dict |None = None,
     error:str |None = None,
     agent_turns:int =0,
-)->None:
+)->bool:
+    """Buffers non-terminal updates; writes complete/failed at once. Returns False when a terminal
+    write was refused because another worker has claimed the job since (see owns_job)."""
+    global _flusher
     now = datetime.now(timezone.utc).isoformat()
-    with _get_conn() as conn:
+    row = (
+        status, 
+        _encode_result(result), 
+        error, 
+        agent_turns, 
+        now, 
+        job_id,
+    )
+    if status not in _TERMINAL_STATUSES:
+        with _pending_lock:
+            _pending[job_id] = row  # later updates for the same job replace earlier ones
+            if _flusher is None:
+                _flusher = threading.Thread(target=_flush_loop, name="argus-db-flush", daemon=True)
+                _flusher.start()
+        return True
+    # terminal writes are durable immediately and supersede anything still buffered;
+    # only the owner finishes a job — a worker that was presumed dead must not overwrite its adopter
+    with _pending_lock:
+        _pending.pop(job_id, None)
+    with _connection() as conn:
+        return conn.execute(
+            "UPDATE jobs SET status=?, result=?, error=?, agent_turns=?, updated_at=?, partial_report=NULL "
+            "WHERE job_id=? AND (owner IS NULL OR owner=?)",
+            (*row, WORKER_ID),
+        ).rowcount > 0
+
+def save_partial_report(job_id:str,report:str)->None:
+    """Stores the report streamed so far. Written straight through (the writer throttles it) and
+    ignored once the job is finished, so a late flush can't outlive the final result."""
+    now = datetime.now(timezone.utc).isoformat()
+    with _connection() as conn:
         conn.execute(
-            "UPDATE jobs SET status=?, result=?, error=?, agent_turns=?, updated_at=? WHERE job_id=?",
-            (
-                status, 
-                json.dumps(result) if result else None, 
-                error, 
-                agent_turns, 
-                now, 
-                job_id,),
+            "UPDATE jobs SET partial_report=?, updated_at=? WHERE job_id=? AND status NOT IN ('complete', 'failed') "
+            "AND (owner IS NULL OR owner=?)",
+            (report, now, job_id, WORKER_ID),
         )
+
+def _encode_result(result:dict | None)->str | bytes | None:
+    if not result:
+        return None
+    text = json.dumps(result)
+    if len(text) >= _RESULT_COMPRESS_MIN:
+        return zlib.compress(text.encode("utf-8"))
+    return text
+
+def _with_buffered(job:dict)->dict:
+    """Overlays a status update still waiting in the write buffer (only the columns the row
+    was read with) and decompresses the result back to JSON text."""
+    with _pending_lock:
+        buffered = _pending.get(job["job_id"])
+    if buffered:
+        job.update((k, v) for k, v in zip(_BUFFERED_COLUMNS, buffered) if k in job)
+    if isinstance(job.get("result"), bytes):
+        job["result"] = zlib.decompress(job["result"]).decode("utf-8")
+    return job
+
 def get_job(job_id:str)->dict | None:
-    with _get_conn() as conn:
+    """The whole row, report included — for the result endpoint."""
+    with _connection() as conn:
         row = conn.execute("SELECT * FROM jobs WHERE job_id=?", (job_id,)).fetchone()
-    return dict(row) if row else None
\ No newline at end of file
+    if not row:
+        return None
+    return _with_buffered(dict(row))
+
+def get_job_summary(job_id:str)->dict | None:
+    """get_job without result/partial_report — status polls never load the report."""
+    with _connection() as conn:
+        row = conn.execute(f"SELECT {_SUMMARY_COLUMNS} FROM jobs WHERE job_id=?", (job_id,)).fetchone()
+    if not row:
+        return None
+    return _with_buffered(dict(row))
+
+def store_findings(findings:list[str])->list[str]:
+    """Moves long finding bodies into finding_bodies and returns what goes into state:
+    a "finding:<digest>" ref for stored bodies, the text itself for short ones."""
+    refs = []
+    rows = []
+    now = datetime.now(timezone.utc).isoformat()
+    for body in findings:
+        if len(body) <= _FINDING_INLINE_MAX:
+            refs.append(body)
+            continue
+        digest = hashlib.sha256(body.encode("utf-8")).hexdigest()[:32]
+        refs.append(FINDING_REF_PREFIX + digest)
+        rows.append((digest, body, now))
+    if rows:
+        with _connection() as conn:
+            # identical bodies share one row; re-storing refreshes created_at for retention
+            conn.executemany(
+                "INSERT INTO finding_bodies (digest, body, created_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(digest) DO UPDATE SET created_at=excluded.created_at",
+                rows,
+            )
+    return refs
+
+def load_findings(refs:list[str])->list[str]:
+    """Resolves refs from state back to text, in order. Inline findings pass through;
+    refs whose body was pruned are dropped."""
+    digests = [r[len(FINDING_REF_PREFIX):] for r in refs if r.startswith(FINDING_REF_PREFIX)]
+    bodies = {}
+    if digests:
+        with _connection() as conn:
+            for i in range(0, len(digests), 500):  # stay under SQLite's bound-parameter limit
+                chunk = digests[i:i+500]
+                rows = conn.execute(
+                    f"SELECT digest, body FROM finding_bodies WHERE digest IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+                bodies.update((row["digest"], row["body"]) for row in rows)
+    findings = []
+    for r in refs:
+        if not r.startswith(FINDING_REF_PREFIX):
+            findings.append(r)
+        elif r[len(FINDING_REF_PREFIX):] in bodies:
+            findings.append(bodies[r[len(FINDING_REF_PREFIX):]])
+    return findings
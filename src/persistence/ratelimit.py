@@ -0,0 +1,88 @@
+import sqlite3
+import threading
+import time
+from limits.storage import Storage
+
+# Fixed-window rate-limit counters in a SQLite file, so every uvicorn worker enforces the same
+# "5/hour" instead of each keeping its own in-memory count. Importing this module registers the
+# sqlite:// scheme with `limits`: Limiter(storage_uri="sqlite:////abs/path/ratelimit.db").
+# A separate file from research.db — a rate-limit check runs on the request path (on the event
+# loop for async routes) and must never queue behind checkpoint writes.
+
+_TIMEOUT = 5  # seconds; the statements are single-row and only other workers' checks compete
+_PRUNE_EVERY = 500  # increments between sweeps of expired windows
+
+_CREATE_TABLE = """
+CREATE TABLE IF NOT EXISTS rate_limits(
+    key TEXT PRIMARY KEY,
+    count INTEGER NOT NULL,
+    expires_at REAL NOT NULL
+);
+"""
+
+
+class SqliteRateLimitStorage(Storage):
+    STORAGE_SCHEME = ["sqlite"]
+
+    def __init__(self, uri: str | None = None, wrap_exceptions: bool = False, **options):
+        # sqlite:///relative/path or sqlite:////absolute/path, as in SQLAlchemy
+        self.path = uri[len("sqlite:///"):] if uri else "ratelimit.db"
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=_TIMEOUT, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(_CREATE_TABLE)
+        self._increments = 0
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+
+    @property
+    def base_exceptions(self) -> type[Exception]:
+        return sqlite3.Error
+
+    def incr(self, key: str, expiry: float, amount: int = 1) -> int:
+        now = time.time()
+        with self._lock:
+            # one statement: a fresh window starts at `amount`, a live one adds to its count
+            count = self._conn.execute(
+                "INSERT INTO rate_limits (key, count, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET "
+                "count = CASE WHEN rate_limits.expires_at <= ? THEN excluded.count ELSE rate_limits.count + excluded.count END, "
+                "expires_at = CASE WHEN rate_limits.expires_at <= ? THEN excluded.expires_at ELSE rate_limits.expires_at END "
+                "RETURNING count",
+                (key, amount, now + expiry, now, now),
+            ).fetchone()[0]
+            self._increments += 1
+            if self._increments % _PRUNE_EVERY == 0:
+                self._conn.execute("DELETE FROM rate_limits WHERE expires_at <= ?", (now,))
+        return count
+
+    def get(self, key: str) -> int:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT count FROM rate_limits WHERE key=? AND expires_at > ?", (key, time.time())
+            ).fetchone()
+        return row[0] if row else 0
+
+    def get_expiry(self, key: str) -> float:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT expires_at FROM rate_limits WHERE key=? AND expires_at > ?", (key, now)
+            ).fetchone()
+        return row[0] if row else now
+
+    def check(self) -> bool:
+        try:
+            with self._lock:
+                self._conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def reset(self) -> int | None:
+        with self._lock:
+            return self._conn.execute("DELETE FROM rate_limits").rowcount
+
+    def clear(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM rate_limits WHERE key=?", (key,))
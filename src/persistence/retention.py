@@ -0,0 +1,124 @@
+import os
+import sqlite3
+import time
+from datetime import datetime, timedelta, timezone
+from src.persistence.db import DB_PATH, SQLITE_TIMEOUT
+
+# Retention for the SqliteSaver tables in research.db. Every super-step of every job is
+# checkpointed under thread_id=job_id and nothing deletes them, so the file and the
+# checkpoint lookups grow forever. Only finished jobs are touched — pending/running
+# threads keep their full history so they can still be resumed.
+
+_KEEP_LAST_ON_FINISH = os.getenv("ARGUS_CHECKPOINT_KEEP_LAST_ONLY", "true").lower() in ("1", "true", "yes")
+_MAX_AGE_DAYS = float(os.getenv("ARGUS_CHECKPOINT_MAX_AGE_DAYS", "30"))   # 0 = never drop whole threads
+_VACUUM_PAGES = int(os.getenv("ARGUS_CHECKPOINT_VACUUM_PAGES", "2000"))   # free pages returned per run
+COMPACTION_INTERVAL_SECONDS = float(os.getenv("ARGUS_CHECKPOINT_COMPACTION_INTERVAL", "3600"))
+
+_FINISHED_JOBS = "SELECT job_id FROM jobs WHERE status IN ('complete', 'failed')"
+
+last_report: dict = {}
+
+
+def _db_bytes(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA page_count").fetchone()[0] * conn.execute("PRAGMA page_size").fetchone()[0]
+
+def _incremental_vacuum_on(conn: sqlite3.Connection) -> bool:
+    return conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+
+def enable_incremental_vacuum() -> dict:
+    """One-time conversion of a research.db created before init_db turned on auto_vacuum.
+    auto_vacuum can only change with a full VACUUM, which rewrites the file under an exclusive
+    lock — every job, request and worker waits on it — so it never runs from the API. Stop the
+    API first:  python -m src.persistence.retention --enable-incremental-vacuum
+    """
+    conn = sqlite3.connect(str(DB_PATH), timeout=SQLITE_TIMEOUT, isolation_level=None)
+    try:
+        if _incremental_vacuum_on(conn):
+            return {"converted": False, "reason": "already incremental"}
+        started = time.monotonic()
+        before = _db_bytes(conn)
+        conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        conn.execute("VACUUM")
+        return {"converted": True, "bytes_before": before, "bytes_after": _db_bytes(conn),
+                "duration_seconds": round(time.monotonic() - started, 3)}
+    finally:
+        conn.close()
+
+def compact_checkpoints() -> dict:
+    """Applies the retention policy, then returns freed pages to the filesystem.
+    Returns a report of what was removed and how many bytes the file shrank by.
+    """
+    global last_report
+    started = time.monotonic()
+    conn = sqlite3.connect(str(DB_PATH), timeout=SQLITE_TIMEOUT, isolation_level=None)  # autocommit: VACUUM can't run in a transaction
+    try:
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+        if not {"checkpoints", "writes", "jobs"} <= tables:
+            return {"skipped": "no checkpoints yet"}
+        before = _db_bytes(conn)
+        checkpoints_deleted = writes_deleted = threads_dropped = findings_deleted = 0
+
+        conn.execute("BEGIN IMMEDIATE")
+        if _MAX_AGE_DAYS > 0:
+            cutoff = (datetime.now(timezone.utc) - timedelta(days=_MAX_AGE_DAYS)).isoformat()
+            old = f"{_FINISHED_JOBS} AND updated_at < ?"
+            threads_dropped = conn.execute(
+                f"SELECT COUNT(DISTINCT thread_id) FROM checkpoints WHERE thread_id IN ({old})", (cutoff,)
+            ).fetchone()[0]
+            checkpoints_deleted += conn.execute(f"DELETE FROM checkpoints WHERE thread_id IN ({old})", (cutoff,)).rowcount
+            writes_deleted += conn.execute(f"DELETE FROM writes WHERE thread_id IN ({old})", (cutoff,)).rowcount
+            if "finding_bodies" in tables:
+                # bodies are shared across jobs by digest; every store refreshes created_at
+                findings_deleted = conn.execute("DELETE FROM finding_bodies WHERE created_at < ?", (cutoff,)).rowcount
+        if _KEEP_LAST_ON_FINISH:
+            # checkpoint ids are time-ordered (uuid6), so MAX() is the latest checkpoint of the thread
+            for table in ("checkpoints", "writes"):
+                deleted = conn.execute(
+                    f"""DELETE FROM {table} WHERE thread_id IN ({_FINISHED_JOBS})
+                        AND checkpoint_id < (SELECT MAX(c.checkpoint_id) FROM checkpoints c
+                                             WHERE c.thread_id = {table}.thread_id AND c.checkpoint_ns = {table}.checkpoint_ns)"""
+                ).rowcount
+                if table == "checkpoints":
+                    checkpoints_deleted += deleted
+                else:
+                    writes_deleted += deleted
+        conn.execute("COMMIT")
+
+        # without auto_vacuum the freed pages stay in the file for reuse — see enable_incremental_vacuum
+        incremental = _incremental_vacuum_on(conn)
+        if incremental:
+            conn.execute(f"PRAGMA incremental_vacuum({_VACUUM_PAGES})")
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        after = _db_bytes(conn)
+        last_report = {
+            "ran_at": datetime.now(timezone.utc).isoformat(),
+            "checkpoints_deleted": checkpoints_deleted,
+            "writes_deleted": writes_deleted,
+            "threads_dropped": threads_dropped,
+            "finding_bodies_deleted": findings_deleted,
+            "bytes_before": before,
+            "bytes_after": after,
+            "bytes_reclaimed": max(0, before - after),
+            "free_pages_left": conn.execute("PRAGMA freelist_count").fetchone()[0],
+            "incremental_vacuum": incremental,
+            "duration_seconds": round(time.monotonic() - started, 3),
+        }
+        return last_report
+    except sqlite3.Error as e:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        last_report = {"ran_at": datetime.now(timezone.utc).isoformat(), "error": str(e)}
+        return last_report
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Checkpoint retention for data/research.db")
+    parser.add_argument("--enable-incremental-vacuum", action="store_true",
+                        help="one-time full VACUUM so later runs can return free pages (stop the API first)")
+    args = parser.parse_args()
+    if args.enable_incremental_vacuum:
+        print(enable_incremental_vacuum())
+    print(compact_checkpoints())
@@ -1,27 +1,78 @@
-import time 
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeout
 import arxiv
+from src.clients import get_arxiv
+from src.tools.cache import get_cached, put_cached, normalize_query
+from src.metrics import instrument_tool
+from src.tools.rate_limit import current_deadline
 
+# Identical queries that arrive while one is already queued on the ArXiv limiter share
+# that request instead of each spending a 3s slot (fan-out branches, concurrent jobs).
+_inflight: dict[tuple, Future] = {}
+_inflight_lock = threading.Lock()
+
+def _error(e)->list[dict]:
+    return [{"title":"Error","authors":[],"summary":f"Arxiv Error: {e}","pdf_url":"","published":""}]
+
+def _fetch(query:str ,max_results:int)->list[dict]:
+    """One ArXiv search. Raises on failure — arxiv_search turns that into the error result."""
+    client=get_arxiv()  # rate limited per request by the shared ARXIV_LIMITER
+    search = arxiv.Search(
+        query=query,
+        max_results=max_results,
+        sort_by=arxiv.SortCriterion.Relevance
+    )
+    results = []
+    for paper in client.results(search):
+        results.append({
+            "title": paper.title,
+            "authors": [a.name for a in paper.authors[:3]],  # first 3 authors
+            "summary": paper.summary[:500],  # first 500 chars of summary
+            "pdf_url": paper.pdf_url,
+            "published": str(paper.published.date()),
+        })
+    put_cached("arxiv", query, results, max_results=max_results)
+    return results
+
+@instrument_tool("arxiv")
 def arxiv_search(query:str ,max_results:int = 3)->list[dict]:
     """Returns a list of dicts :[{title , authors,summary,pdf_url,published},...]
-    the sleep(3)is rate limit fix Arxiv 503s on rapid successive calls.
+    ArXiv 503s on rapid successive calls — every request waits on the process-wide
+    token bucket in src/clients.py (one request per 3s), not a sleep per result. A request whose
+    slot would come after the caller's timeout fails fast instead of taking the slot.
     """
-    try: 
-        client=arxiv.Client()
-        search = arxiv.Search(
-            query=query,
-            max_results=max_results,
-            sort_by=arxiv.SortCriterion.Relevance
-        )
-        results = []
-        for paper in client.results(search):
-            results.append({
-                "title": paper.title,
-                "authors": [a.name for a in paper.authors[:3]],  # first 3 authors
-                "summary": paper.summary[:500],  # first 500 chars of summary
-                "pdf_url": paper.pdf_url,
-                "published": str(paper.published.date()),
-            })
-            time.sleep(3)  # rate limit fix
-        return results
+    cached = get_cached("arxiv", query, max_results=max_results)
+    if cached is not None:
+        return cached
+    key = (normalize_query(query), max_results)
+    while True:
+        with _inflight_lock:
+            leader = _inflight.get(key)
+            if leader is None:
+                future = _inflight[key] = Future()
+        if leader is None:
+            break
+        deadline = current_deadline()  # don't hold an arxiv thread longer than our own caller waits
+        try:
+            return leader.result(timeout=None if deadline is None else max(0.0, deadline - time.monotonic()))
+        except FutureTimeout:
+            return _error("timed out waiting for an identical query")
+        except Exception:
+            # only successes are shared — the leader may have run out of its own (earlier) deadline,
+            # so try again under ours: lead the next request or follow whoever does
+            continue
+    error = None
+    try:
+        results = _fetch(query, max_results)
     except Exception as e:
-        return [{"title":"Error","authors":[],"summary":f"Arxiv Error: {e}","pdf_url":"","published":""}]
\ No newline at end of file
+        error = e
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)  # before waking followers, so a retrying one can't find this leader again
+    if error is not None:
+        future.set_exception(error)
+        return _error(error)
+    future.set_result(results)
+    return results
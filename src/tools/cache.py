@@ -0,0 +1,42 @@
+import hashlib
+import json
+import os
+import re
+from typing import Any
+from src.persistence.cache import SqliteCache
+from src.persistence.db import DB_PATH
+
+# Lives next to research.db. Shared by every job in the process — the same sub-question
+# asked by two jobs only goes to the network once per TTL.
+TOOL_CACHE_PATH = DB_PATH.parent / "tool_cache.db"
+
+_TOOL_TTL = {
+    "tavily": 6 * 3600,        # web results go stale fastest
+    "arxiv": 7 * 86400,
+    "wikipedia": 7 * 86400,
+}
+_ENABLED = os.getenv("ARGUS_TOOL_CACHE", "true").lower() in ("1", "true", "yes")
+_cache = SqliteCache(TOOL_CACHE_PATH, max_entries=int(os.getenv("ARGUS_TOOL_CACHE_MAX_ENTRIES", "5000")))
+
+
+def normalize_query(query: str) -> str:
+    """Case, whitespace and trailing punctuation don't change what a search returns."""
+    return re.sub(r"\s+", " ", query).strip().strip("?!.").strip().lower()
+
+def _key(tool: str, query: str, params: dict) -> str:
+    raw = json.dumps([tool, normalize_query(query), params], sort_keys=True)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+def get_cached(tool: str, query: str, **params) -> Any | None:
+    """Returns the cached result for (tool, query, params) or None. Call before any outbound request."""
+    if not _ENABLED:
+        return None
+    return _cache.get(tool, _key(tool, query, params))
+
+def put_cached(tool: str, query: str, value: Any, **params) -> None:
+    """Only call with successful results — error payloads must not be served from cache."""
+    if _ENABLED:
+        _cache.set(tool, _key(tool, query, params), value, ttl=_TOOL_TTL[tool])
+
+def tool_cache_stats() -> dict:
+    return {"enabled": _ENABLED, **_cache.stats()}
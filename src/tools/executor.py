@@ -0,0 +1,93 @@
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from typing import Any, Callable
+from src.metrics import TOOL_TIMEOUTS
+from src.tools.rate_limit import deadline_scope
+
+# One process-wide pool shared by every researcher turn (and every fan-out branch).
+# Never used as a context manager — shutdown(wait=True) would block on a hung provider.
+_EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(os.getenv("ARGUS_TOOL_THREADS", "16")),
+    thread_name_prefix="argus-tool",
+)
+# ArXiv calls spend most of their time waiting on the process-wide limiter (one request per 3s),
+# so a backlog of them would hold shared threads that Tavily/Wikipedia need — they get their own.
+_ARXIV_EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(os.getenv("ARGUS_ARXIV_THREADS", "4")),
+    thread_name_prefix="argus-arxiv",
+)
+
+def _executor(name:str)->ThreadPoolExecutor:
+    return _ARXIV_EXECUTOR if name == "arxiv" else _EXECUTOR
+
+def _call(deadline:float,fn:Callable,kwargs:dict)->Any:
+    # the deadline lets rate limiters inside the tool give up instead of queueing past the timeout
+    with deadline_scope(deadline):
+        return fn(**kwargs)
+
+def submit_tools(calls:dict[str, tuple[Callable, dict, float, Any]])->tuple[dict, float]:
+    """Starts tool calls on the shared pool without waiting. Pass the result to gather_tools —
+    timeouts count from here, so work started early (speculative search) gets less waiting later."""
+    start = time.monotonic()
+    futures = {
+        name: _executor(name).submit(_call, start + timeout, fn, kwargs)
+        for name, (fn, kwargs, timeout, _) in calls.items()
+    }
+    return futures, start
+
+def gather_tools(calls:dict[str, tuple[Callable, dict, float, Any]],submitted:tuple[dict, float])->tuple[dict[str, Any], list[str]]:
+    futures, start = submitted
+    results = {}
+    timed_out = []
+    for name, future in futures.items():
+        _, _, timeout, fallback = calls[name]
+        remaining = max(0.0, start + timeout - time.monotonic())  # timeouts count from submission, not from this wait
+        try:
+            results[name] = future.result(timeout=remaining)
+        except FutureTimeout:
+            future.cancel()  # no-op if already running, frees the slot if it never started
+            timed_out.append(name)
+            TOOL_TIMEOUTS.inc(tool=name)
+            results[name] = fallback
+        except Exception:
+            results[name] = fallback
+    return results, timed_out
+
+def run_tools(calls:dict[str, tuple[Callable, dict, float, Any]])->tuple[dict[str, Any], list[str]]:
+    """Runs tool calls concurrently.
+    calls: {name: (fn, kwargs, timeout_seconds, fallback)}
+    Returns ({name: result}, [names that timed out]). A tool that times out or raises gets its
+    fallback so the turn keeps whatever the other tools returned — the slow call keeps running
+    in the pool but nobody waits for it.
+    """
+    return gather_tools(calls, submit_tools(calls))
+
+
+async def arun_tools(calls:dict[str, tuple[Callable, dict, float, Any]])->tuple[dict[str, Any], list[str]]:
+    """Async counterpart of run_tools with the same contract.
+    Coroutine functions run on the event loop; sync-only tools (arxiv) go to a thread pool
+    so a slow provider never holds the loop.
+    """
+    loop = asyncio.get_running_loop()
+
+    async def _one(name:str):
+        fn, kwargs, timeout, fallback = calls[name]
+        if asyncio.iscoroutinefunction(fn):
+            pending = fn(**kwargs)
+        else:
+            pending = loop.run_in_executor(_executor(name), _call, time.monotonic() + timeout, fn, kwargs)
+        try:
+            return await asyncio.wait_for(pending, timeout=timeout), False
+        except asyncio.TimeoutError:
+            TOOL_TIMEOUTS.inc(tool=name)
+            return fallback, True
+        except Exception:
+            return fallback, False
+
+    outcomes = await asyncio.gather(*(_one(name) for name in calls))
+    results = {name: result for name, (result, _) in zip(calls, outcomes)}
+    timed_out = [name for name, (_, late) in zip(calls, outcomes) if late]
+    return results, timed_out
@@ -0,0 +1,76 @@
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Absolute time.monotonic() by which the running tool call has to be done — set by the tool
+# executor around each call, so limiters deep inside a client library can see it.
+_deadline: ContextVar[float | None] = ContextVar("tool_deadline", default=None)
+
+
+@contextmanager
+def deadline_scope(deadline: float | None):
+    token = _deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def current_deadline() -> float | None:
+    return _deadline.get()
+
+
+class RateLimitTimeout(Exception):
+    """The token would only come after the caller's deadline — nothing was reserved."""
+
+
+class TokenBucket:
+    """Thread-safe token bucket shared by every job in the process.
+    Callers reserve a token under the lock and then sleep outside it, so waiters queue up
+    in arrival order without holding the lock. acquire() blocks the calling thread — ArXiv, the
+    only rate-limited provider, is sync-only and runs on its own pool in both graph modes. It takes
+    an optional deadline and fails fast, without reserving, when the token can't be had by then.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate              # tokens per second
+        self.capacity = capacity      # burst size
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.acquired = 0
+        self.rejected = 0
+        self.total_wait = 0.0
+
+    def _reserve(self, deadline: float | None) -> float:
+        """Takes one token (possibly going into debt) and returns how long to wait for it.
+        Raises RateLimitTimeout instead when that wait would run past `deadline` — a caller that
+        has already given up shouldn't hold a slot that pushes every later caller back."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            wait = (1 - self._tokens) / self.rate if self._tokens < 1 else 0.0
+            if deadline is not None and now + wait > deadline:
+                self.rejected += 1
+                raise RateLimitTimeout(f"rate limit wait {wait:.1f}s is past the caller's deadline")
+            self._tokens -= 1
+            self.acquired += 1
+            self.total_wait += wait
+        return wait
+
+    def acquire(self, deadline: float | None = None) -> float:
+        wait = self._reserve(deadline)
+        if wait:
+            time.sleep(wait)
+        return wait
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "rate_per_second": self.rate,
+                "acquired": self.acquired,
+                "rejected": self.rejected,
+                "avg_wait_seconds": round(self.total_wait / self.acquired, 3) if self.acquired else 0.0,
+            }
@@ -1,18 +1,49 @@
-import os 
-from tavily import TavilyClient
+import asyncio
+from src.clients import get_tavily, get_async_tavily
+from src.tools.cache import get_cached, put_cached
+from src.metrics import instrument_tool
 
+def _error(e:Exception)->list[dict]:
+    return [{"title":"Error","url":"","content":f"Tavily Error: {e}","score":0}]
+
+@instrument_tool("tavily")
 def tavily_search(query: str, max_results:int = 5)->list[dict]:
     """Returns a list of dicts :[{title, url,content score},...]
     Returns [] on any error so the researcher never crashes
     """
+    cached = get_cached("tavily", query, max_results=max_results)
+    if cached is not None:
+        return cached
     try: 
-        client = TavilyClient(api_key=os.getenv("TAVILY_API_KEY"))
+        client = get_tavily()
         response = client.search(
             query=query,
             max_results=max_results,
             search_depth="basic",
             include_answer=True, #short ai summary alongside raw results
         )
-        return response.get("results", [])
+        results = response.get("results", [])
+        put_cached("tavily", query, results, max_results=max_results)
+        return results
+    except Exception as e:
+        return _error(e)
+
+@instrument_tool("tavily")
+async def atavily_search(query: str, max_results:int = 5)->list[dict]:
+    """Async variant of tavily_search for the async graph — same result shape and caching."""
+    cached = await asyncio.to_thread(get_cached, "tavily", query, max_results=max_results)  # sqlite, off the loop
+    if cached is not None:
+        return cached
+    try: 
+        client = get_async_tavily()
+        response = await client.search(
+            query=query,
+            max_results=max_results,
+            search_depth="basic",
+            include_answer=True,
+        )
+        results = response.get("results", [])
+        await asyncio.to_thread(put_cached, "tavily", query, results, max_results=max_results)
+        return results
     except Exception as e:
-        return [{"title":"Error","url":"","content":f"Tavily Error: {e}","score":0}]
\ No newline at end of file
+        return _error(e)
@@ -1,25 +1,95 @@
+import asyncio
 import wikipedia
+from wikipedia import wikipedia as wiki_api
+from src.clients import get_http_session, get_async_http
+from src.tools.cache import get_cached, put_cached
+from src.metrics import instrument_tool
 
+def _summary_params(title:str)->dict:
+    """One API round trip for extract + canonical url + disambiguation flag.
+    wikipedia.page() followed by wikipedia.summary() costs 3-4 requests for the same article.
+    """
+    return {
+        "action": "query",
+        "format": "json",
+        "prop": "extracts|info|pageprops",
+        "explaintext": "",
+        "exsentences": 5,
+        "inprop": "url",
+        "ppprop": "disambiguation",
+        "redirects": "",
+        "titles": title,
+    }
+
+def _parse_summary(response:dict,title:str)->dict | None:
+    """Returns {title,summary,url}, or None when the title is a disambiguation page."""
+    page = next(iter(response["query"]["pages"].values()))
+    if "missing" in page or "invalid" in page:
+        raise wikipedia.PageError(None, title)
+    if "disambiguation" in page.get("pageprops", {}):
+        return None
+    return{
+        "title": page["title"],
+        "summary": page.get("extract", ""),
+        "url": page["fullurl"],
+    }
+
+def _fetch_summary(title:str)->dict | None:
+    response = get_http_session("wikipedia").get(
+        wiki_api.API_URL, params=_summary_params(title),  # API_URL follows set_lang()
+        headers={"User-Agent": wiki_api.USER_AGENT}, timeout=10,
+    )
+    return _parse_summary(response.json(), title)
+
+async def _afetch_summary(title:str)->dict | None:
+    response = await get_async_http("wikipedia").get(
+        wiki_api.API_URL, params=_summary_params(title),
+        headers={"User-Agent": wiki_api.USER_AGENT},
+    )
+    return _parse_summary(response.json(), title)
+
+def _disambiguation_options(query:str)->list[str]:
+    # rare path — the library's own page() lookup knows how to list the options
+    try:
+        wikipedia.page(query,auto_suggest=False)
+    except wikipedia.DisambiguationError as e:
+        return e.options
+    return []
+
+@instrument_tool("wikipedia")
 def wikipedia_search(query:str)->dict:
     """Returns {title,summary,url} or {error} or failure"""
     
+    cached = get_cached("wikipedia", query)
+    if cached is not None:
+        return cached
     try:
         wikipedia.set_lang("en")
-        page = wikipedia.page(query,auto_suggest=False)
-        return{
-            "title": page.title,
-            "summary":wikipedia.summary(query,sentences=5,auto_suggest=False),
-            "url": page.url
-        }
-    except wikipedia.DisambiguationError as e:
-            try:
-                page= wikipedia.page(e.options[0],auto_suggest=False)
-                return{
-                    "title": page.title,
-                    "summary":wikipedia.summary(e.options[0],sentences=5,auto_suggest=False),
-                    "url": page.url
-                }
-            except Exception:
-                return {"error": f"DisambiguationError: {e.options[:3]}"}
+        result = _fetch_summary(query)
+        if result is None:
+            options = _disambiguation_options(query)
+            result = _fetch_summary(options[0]) if options else None
+            if result is None:
+                return {"error": f"DisambiguationError: {options[:3]}"}
+        put_cached("wikipedia", query, result)
+        return result
+    except Exception as e:
+            return{"error": str(e)}
+
+@instrument_tool("wikipedia")
+async def awikipedia_search(query:str)->dict:
+    """Async variant of wikipedia_search for the async graph — same result shape and caching."""
+    cached = await asyncio.to_thread(get_cached, "wikipedia", query)  # sqlite, off the loop
+    if cached is not None:
+        return cached
+    try:
+        result = await _afetch_summary(query)
+        if result is None:
+            options = await asyncio.to_thread(_disambiguation_options, query)
+            result = await _afetch_summary(options[0]) if options else None
+            if result is None:
+                return {"error": f"DisambiguationError: {options[:3]}"}
+        await asyncio.to_thread(put_cached, "wikipedia", query, result)
+        return result
     except Exception as e:
-            return{"error": str(e)}
\ No newline at end of file
+            return{"error": str(e)}
@@ -1,4 +1,5 @@
 import time 
+import json
 import requests 
 import streamlit as st
 import os
@@ -59,7 +60,7 @@ if st.button("🚀 Start Research", type="primary", disabled=not query.strip()):
         st.write(f"✅ Job created: `{job_id}`")
         st.write(f"⏱ Estimated time: ~{job['estimated_seconds']}s")
 
-        # Step 2 — poll status
+        # Step 2 — follow progress over server-sent events (no polling)
         st.write("⏳ Waiting for research to complete...")
         agent_labels = {
             "planner": "📋 Planner — breaking down query",
@@ -68,34 +69,38 @@ if st.button("🚀 Start Research", type="primary", disabled=not query.strip()):
             "writer": "✍️ Writer — synthesizing report",
         }
 
-        elapsed = 0
-        poll_interval = 3
-        max_wait = 180   # 3 minutes hard timeout
-
-        while elapsed < max_wait:
-            time.sleep(poll_interval)
-            elapsed += poll_interval
-
-            try:
-                status_resp = requests.get(
-                    f"{API_BASE}/jobs/{job_id}/status", timeout=5
-                ).json()
-            except Exception:
-                continue
-
-            current_status = status_resp.get("status", "unknown")
-
-            if current_status == "running":
-                st.write(f"🔄 Running... ({elapsed}s elapsed)")
-            elif current_status == "complete":
-                status_box.update(label="✅ Research complete!", state="complete")
-                break
-            elif current_status == "failed":
-                status_box.update(label="❌ Research failed", state="error")
-                st.error("Job failed. Check API logs.")
-                st.stop()
+        started = time.time()
+        final_event = None
+        try:
+            # read timeout > the server's 15s keep-alive, so a silent stream means a dead connection
+            with requests.get(
+                f"{API_BASE}/jobs/{job_id}/events", stream=True, timeout=(5, 60)
+            ) as events_resp:
+                events_resp.raise_for_status()
+                for line in events_resp.iter_lines(decode_unicode=True):
+                    if not line or not line.startswith("data:"):
+                        continue   # blank separators, "event:" lines and ": keep-alive" comments
+                    event = json.loads(line[len("data:"):])
+                    elapsed = int(time.time() - started)
+                    if event["event"] == "node" and event.get("next_agent") in agent_labels:
+                        st.write(f"{agent_labels[event['next_agent']]} ({elapsed}s elapsed)")
+                    elif event["event"] == "node" and event.get("message"):
+                        st.caption(event["message"])
+                    elif event["event"] in ("complete", "failed"):
+                        final_event = event
+                        break
+        except Exception as e:
+            st.error(f"Lost connection to the progress stream: {e}")
+            st.stop()
+
+        if final_event is None:
+            st.error("Progress stream ended before the job finished. Check API logs.")
+            st.stop()
+        elif final_event["event"] == "complete":
+            status_box.update(label="✅ Research complete!", state="complete")
         else:
-            st.error("Timeout — research took too long. Try 'quick' depth.")
+            status_box.update(label="❌ Research failed", state="error")
+            st.error(f"Job failed: {final_event.get('error', 'check API logs')}")
             st.stop()
 
     # Step 3 — fetch and display result